@@ -0,0 +1,49 @@
+"""
+Benchmark the compiled Black-Scholes kernels against the NumPy batch functions
+
+Run with `python benchmarks/bench_compiled.py` from the package root. Without
+numba installed both rows time the NumPy implementation.
+"""
+
+import timeit
+
+import numpy as np
+
+from final import blackscholes as bs
+from final import compiled
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def best_of(stmt, number: int = 5, repeat: int = 5) -> float:
+    """Best per-call time in seconds"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    print(f"numba available: {compiled.HAS_NUMBA}")
+    print(f"{'size':>10}{'numpy greeks':>16}{'compiled greeks':>18}{'speedup':>10}{'max |diff|':>12}")
+
+    # Compile outside of the timed region
+    compiled.greeks(100.0, 100.0, 0.05, 0.0, 0.2, 1.0, True)
+
+    rng = np.random.default_rng(0)
+    for n in SIZES:
+        s = rng.uniform(50, 150, n)
+        k = rng.uniform(50, 150, n)
+        v = rng.uniform(0.1, 0.5, n)
+        t = rng.uniform(0.01, 2, n)
+        is_call = rng.random(n) < 0.5
+        args = (s, k, 0.05, 0.01, v, t, is_call)
+
+        numpy_time = best_of(lambda: bs.batch_greeks(*args))
+        compiled_time = best_of(lambda: compiled.greeks(*args))
+        diff = np.max(np.abs(compiled.greeks(*args).price - bs.batch_greeks(*args).price))
+        print(
+            f"{n:>10}{numpy_time * 1e3:>13.2f} ms{compiled_time * 1e3:>15.2f} ms"
+            f"{numpy_time / compiled_time:>9.1f}x{diff:>12.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark the standard normal CDF backends, standalone and inside pricing
+
+Run with `python benchmarks/bench_normal.py` from the package root.
+"""
+
+import timeit
+
+import numpy as np
+from scipy.stats import norm
+
+from final import blackscholes as bs
+from final import normal
+
+SCALAR_ARGS = dict(s=75.5, k=50.25, r=0.10, q=0.02, v=0.35, t=2.5, is_call=True)
+BATCH_SIZE = 50_000
+
+
+def best_of(stmt, number: int, repeat: int = 5) -> float:
+    """Best per-call time in seconds"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-6, 6, BATCH_SIZE)
+    s = rng.uniform(50, 150, BATCH_SIZE)
+    k = rng.uniform(50, 150, BATCH_SIZE)
+    v = rng.uniform(0.1, 0.5, BATCH_SIZE)
+    t = rng.uniform(0.01, 2, BATCH_SIZE)
+    is_call = rng.random(BATCH_SIZE) < 0.5
+
+    frozen = norm(0, 1)
+    print(f"{'backend':<14}{'cdf scalar':>14}{'cdf batch':>14}{'price scalar':>16}{'greeks batch':>16}{'max |err|':>12}")
+    print(
+        f"{'scipy.stats':<14}"
+        f"{best_of(lambda: frozen.cdf(0.3), 10_000) * 1e6:>11.2f} us"
+        f"{best_of(lambda: frozen.cdf(x), 20) * 1e3:>11.2f} ms"
+        f"{'':>16}{'':>16}{0.0:>12.1e}"
+    )
+
+    exact = normal.SpecialNormal()
+    for name, backend in [("special", exact), ("table", normal.TableNormal())]:
+        previous = normal.set_backend(backend)
+        try:
+            err = np.max(np.abs(backend.cdf(x) - exact.cdf(x)))
+            print(
+                f"{name:<14}"
+                f"{best_of(lambda: normal.cdf(0.3), 10_000) * 1e6:>11.2f} us"
+                f"{best_of(lambda: normal.cdf(x), 20) * 1e3:>11.2f} ms"
+                f"{best_of(lambda: bs.price(**SCALAR_ARGS), 5_000) * 1e6:>13.2f} us"
+                f"{best_of(lambda: bs.batch_greeks(s, k, 0.05, 0.01, v, t, is_call), 20) * 1e3:>13.2f} ms"
+                f"{err:>12.1e}"
+            )
+        finally:
+            normal.set_backend(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Reproducible benchmark harness for the pricing hot paths
+
+Every run appends throughput, timing percentiles and peak traced memory per
+case to a JSON history file, and compares median timings against a stored
+baseline, exiting with status 1 if any case regressed beyond the threshold.
+
+    python benchmarks/run.py --save-baseline   # record a baseline
+    python benchmarks/run.py                   # compare against it
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import final as fn
+from final import blackscholes as bs
+
+HERE = Path(__file__).resolve().parent
+
+
+@dataclass
+class Case:
+    """A benchmark case: setup returns the callable to time"""
+
+    name: str
+    items: int
+    """Units of work per call, e.g. options priced or path steps generated"""
+    setup: Callable[[], Callable[[], object]]
+
+
+@dataclass
+class Result:
+    """Storage class for the measurements of one case"""
+
+    name: str
+    items: int
+    repeat: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    throughput: float
+    """Items per second at the median timing"""
+    peak_memory: int
+    """Peak bytes traced by tracemalloc during one call"""
+
+
+def _book(n: int, seed: int = 0) -> tuple:
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(50, 150, n),
+        rng.uniform(50, 150, n),
+        0.05,
+        0.01,
+        rng.uniform(0.1, 0.5, n),
+        rng.uniform(0.01, 2, n),
+        rng.random(n) < 0.5,
+    )
+
+
+def _scalar_bs(n: int) -> Callable[[], object]:
+    args = [tuple(float(a) if np.ndim(a) == 0 else a[i] for a in _book(n)) for i in range(n)]
+    return lambda: [bs.price(*a) for a in args]
+
+
+def _batch_bs(n: int) -> Callable[[], object]:
+    args = _book(n)
+    return lambda: bs.batch_greeks(*args)
+
+
+def _gbm(num_paths: int, num_steps: int) -> Callable[[], object]:
+    def run():
+        return fn.GBMPathGenerator(
+            num_paths,
+            num_steps,
+            s0=100.0,
+            drift=0.05,
+            diffusion=0.2,
+            to_time=1.0,
+            rng=fn.StandardNormalRNG(seed=1),
+        ).generate()
+
+    return run
+
+
+def _gbm_float32(num_paths: int, num_steps: int) -> Callable[[], object]:
+    generator = fn.GBMPathGenerator(
+        num_paths,
+        num_steps,
+        s0=100.0,
+        drift=0.05,
+        diffusion=0.2,
+        to_time=1.0,
+        rng=fn.StandardNormalRNG(seed=1),
+        dtype=np.float32,
+    )
+    out = np.empty((num_paths, num_steps + 1), dtype=np.float32)
+    return lambda: generator.generate(out=out)
+
+
+def _lsm(num_paths: int, num_steps: int) -> Callable[[], object]:
+    def run():
+        generator = fn.GBMPathGenerator(
+            num_paths,
+            num_steps,
+            s0=36.0,
+            drift=0.06,
+            diffusion=0.2,
+            to_time=1.0,
+            rng=fn.StandardNormalRNG(seed=1),
+        )
+        return fn.lsm_price(40.0, 0.06, False, generator)
+
+    return run
+
+
+def cases(quick: bool) -> list[Case]:
+    scale = 10 if quick else 1
+    gbm_sizes = [(10_000, 50), (10_000, 252), (100_000, 50)]
+    lsm_sizes = [(10_000, 50), (50_000, 50)]
+    out = [
+        Case("bs_scalar_price", 2_000 // scale, lambda: _scalar_bs(2_000 // scale)),
+        Case("bs_batch_greeks", 100_000 // scale, lambda: _batch_bs(100_000 // scale)),
+    ]
+    for p, s in gbm_sizes:
+        p //= scale
+        out.append(Case(f"gbm_{p}x{s}", p * s, lambda p=p, s=s: _gbm(p, s)))
+        out.append(Case(f"gbm_f32_{p}x{s}", p * s, lambda p=p, s=s: _gbm_float32(p, s)))
+    for p, s in lsm_sizes:
+        p //= scale
+        out.append(Case(f"lsm_{p}x{s}", p * s, lambda p=p, s=s: _lsm(p, s)))
+    return out
+
+
+def measure(case: Case, repeat: int) -> Result:
+    """Time a case after one warm-up call, then trace the memory of one call"""
+    func = case.setup()
+    func()
+
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(timings, [50, 90, 99])
+    return Result(
+        name=case.name,
+        items=case.items,
+        repeat=repeat,
+        mean=float(timings.mean()),
+        p50=float(p50),
+        p90=float(p90),
+        p99=float(p99),
+        throughput=case.items / float(p50),
+        peak_memory=peak,
+    )
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=HERE,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[Result], baseline: dict, threshold: float) -> list[str]:
+    """Names of the cases whose median is slower than baseline by > threshold"""
+    previous = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        if r.name not in previous:
+            continue
+        ratio = r.p50 / previous[r.name]["p50"]
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"  {r.name:<22}{ratio:>8.2f}x baseline {flag}")
+        if flag:
+            regressions.append(r.name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--quick", action="store_true", help="10x smaller problem sizes")
+    parser.add_argument("--filter", default="", help="only run cases containing this")
+    parser.add_argument("--history", type=Path, default=HERE / "history.json")
+    parser.add_argument("--baseline", type=Path, default=HERE / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown of the median before failing",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'case':<22}{'p50':>11}{'p90':>11}{'p99':>11}{'items/s':>12}{'peak MiB':>10}")
+    for case in cases(args.quick):
+        if args.filter not in case.name:
+            continue
+        r = measure(case, args.repeat)
+        results.append(r)
+        print(
+            f"{r.name:<22}{r.p50 * 1e3:>8.2f} ms{r.p90 * 1e3:>8.2f} ms{r.p99 * 1e3:>8.2f} ms"
+            f"{r.throughput:>12.3g}{r.peak_memory / 2**20:>10.1f}"
+        )
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": [asdict(r) for r in results],
+    }
+    history = json.loads(args.history.read_text()) if args.history.exists() else []
+    history.append(record)
+    args.history.write_text(json.dumps(history, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(record, indent=2))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("no baseline found, run with --save-baseline first")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("quick") != args.quick:
+        print("baseline was recorded with a different --quick setting, skipping comparison")
+        return 0
+    print(f"comparison against baseline {baseline.get('commit')} ({baseline['timestamp']}):")
+    regressions = compare(results, baseline, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
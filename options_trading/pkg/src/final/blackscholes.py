@@ -2,10 +2,12 @@
 Implementation of Black-Scholes formulae
 """
 
+from dataclasses import dataclass
+
 import numpy as np
-from scipy.stats import norm
+import numpy.typing as npt
 
-N = norm(0, 1)
+from final import normal
 
 
 def d1(s: float, k: float, r: float, q: float, v: float, t: float) -> float:
@@ -118,9 +120,9 @@ def price(
     D2 = d2(s, k, r, q, v, t)
 
     if is_call:
-        p = s * np.exp(-q * t) * N.cdf(D1) - k * np.exp(-r * t) * N.cdf(D2)
+        p = s * np.exp(-q * t) * normal.cdf(D1) - k * np.exp(-r * t) * normal.cdf(D2)
     else:
-        p = k * np.exp(-r * t) * N.cdf(-D2) - s * np.exp(-q * t) * N.cdf(-D1)
+        p = k * np.exp(-r * t) * normal.cdf(-D2) - s * np.exp(-q * t) * normal.cdf(-D1)
 
     return p
 
@@ -147,9 +149,9 @@ def delta(
     D1 = d1(s, k, r, q, v, t)
 
     if is_call:
-        d =  np.exp(-q * t) * N.cdf(D1)
+        d =  np.exp(-q * t) * normal.cdf(D1)
     else:
-        d =  -np.exp(-q * t) * N.cdf(-D1)
+        d =  -np.exp(-q * t) * normal.cdf(-D1)
     
     return d
 
@@ -179,13 +181,13 @@ def theta(
     if t == 0:
         raise ValueError("Time to expiry (t) must be greater than 0.")
 
-    term1 = -(s * v * np.exp(-q * t) * N.pdf(D1)) / (2 * np.sqrt(t))
+    term1 = -(s * v * np.exp(-q * t) * normal.pdf(D1)) / (2 * np.sqrt(t))
 
     # Implementing separate formulas for Call and Put
     if is_call:
-        t = (term1 + q * s * np.exp(-q * t) * N.cdf(D1) - r * k * np.exp(-r * t) * N.cdf(D2))
+        t = (term1 + q * s * np.exp(-q * t) * normal.cdf(D1) - r * k * np.exp(-r * t) * normal.cdf(D2))
     else:
-        t =  (term1 - q * s * np.exp(-q * t) * N.cdf(-D1) + r * k * np.exp(-r * t) * N.cdf(-D2))
+        t =  (term1 - q * s * np.exp(-q * t) * normal.cdf(-D1) + r * k * np.exp(-r * t) * normal.cdf(-D2))
 
     return t
 
@@ -338,7 +340,7 @@ def gamma(s: float, k: float, r: float, q: float, v: float, t: float) -> float:
 
     D1 = d1(s, k, r, q, v, t)
 
-    g = (np.exp(-q * t) * N.pdf(D1)) / (s * v * np.sqrt(t))
+    g = (np.exp(-q * t) * normal.pdf(D1)) / (s * v * np.sqrt(t))
 
     return g
 
@@ -361,6 +363,437 @@ def vega(s: float, k: float, r: float, q: float, v: float, t: float) -> float:
 
     D1 = d1(s, k, r, q, v, t)
 
-    v = s * np.exp(-q * t) * N.pdf(D1) * np.sqrt(t)
+    v = s * np.exp(-q * t) * normal.pdf(D1) * np.sqrt(t)
 
     return v
+
+
+# Batch (array) API
+#
+# The functions below accept NumPy arrays, or anything broadcastable against
+# each other, for every market input along with a boolean call/put mask, and
+# evaluate the whole set in one vectorized pass. Expired (t <= 0) and zero
+# volatility entries do not raise, they take their deterministic limit instead:
+# the price collapses to the discounted forward intrinsic value, delta to the
+# discounted exercise indicator and gamma/vega to zero.
+#
+# Every log, sqrt, exp and normal CDF/PDF evaluation lives in _batch_terms so
+# that batch_greeks evaluates each of them exactly once per option.
+
+
+@dataclass
+class BatchGreeks:
+    """Storage class for batch Black-Scholes output"""
+
+    price: np.ndarray
+    """Black-Scholes prices"""
+    delta: np.ndarray
+    """Black-Scholes deltas"""
+    gamma: np.ndarray
+    """Black-Scholes gammas"""
+    vega: np.ndarray
+    """Black-Scholes vegas"""
+    theta: np.ndarray
+    """Black-Scholes thetas"""
+    rho: np.ndarray
+    """Black-Scholes rhos"""
+    vanna: np.ndarray | None = None
+    """Sensitivity of delta to volatility, only with higher_order=True"""
+    volga: np.ndarray | None = None
+    """Sensitivity of vega to volatility (vomma), only with higher_order=True"""
+    charm: np.ndarray | None = None
+    """Delta decay per year, only with higher_order=True"""
+    speed: np.ndarray | None = None
+    """Sensitivity of gamma to spot, only with higher_order=True"""
+    color: np.ndarray | None = None
+    """Gamma decay per year, only with higher_order=True"""
+
+
+@dataclass
+class _BatchTerms:
+    """Shared intermediates of the Black-Scholes formulae"""
+
+    s: np.ndarray
+    k: np.ndarray
+    r: np.ndarray
+    q: np.ndarray
+    v: np.ndarray
+    t: np.ndarray
+    """Time to expiry floored at 0"""
+    sqrt_t: np.ndarray
+    sd: np.ndarray
+    """Total standard deviation v * sqrt(t)"""
+    degenerate: np.ndarray
+    """Mask of expired or zero volatility entries"""
+    d1: np.ndarray
+    d2: np.ndarray
+    sign: np.ndarray
+    """+1 for calls and -1 for puts"""
+    disc_q: np.ndarray
+    """Dividend discount factor exp(-q t)"""
+    disc_r: np.ndarray
+    """Risk free discount factor exp(-r t)"""
+    pdf_d1: np.ndarray
+    """Standard normal density at d1, zero where degenerate"""
+    cdf_d1: np.ndarray
+    """N(d1) for calls and N(-d1) for puts"""
+    cdf_d2: np.ndarray
+    """N(d2) for calls and N(-d2) for puts"""
+
+
+def _batch_terms(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike = True,
+) -> _BatchTerms:
+    """Broadcast the inputs and evaluate every shared intermediate once
+
+    Degenerate entries get d1 = d2 = +/-inf depending on the side of the
+    forward the strike is on, or 0 when it is exactly at the forward.
+    """
+    s, k, r, q, v, t, is_call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (s, k, r, q, v, t)),
+        np.asarray(is_call, dtype=bool),
+    )
+    t = np.maximum(t, 0.0)
+    sqrt_t = np.sqrt(t)
+    sd = v * sqrt_t
+    degenerate = sd <= 0
+    m = np.log(s / k) + (r - q) * t
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (m + 0.5 * sd**2) / sd
+    limit = np.where(m > 0, np.inf, np.where(m < 0, -np.inf, 0.0))
+    a = np.where(degenerate, limit, a)
+    b = np.where(degenerate, limit, a - sd)
+    sign = np.where(is_call, 1.0, -1.0)
+
+    return _BatchTerms(
+        s=s,
+        k=k,
+        r=r,
+        q=q,
+        v=v,
+        t=t,
+        sqrt_t=sqrt_t,
+        sd=sd,
+        degenerate=degenerate,
+        d1=a,
+        d2=b,
+        sign=sign,
+        disc_q=np.exp(-q * t),
+        disc_r=np.exp(-r * t),
+        pdf_d1=np.where(degenerate, 0.0, normal.pdf(a)),
+        cdf_d1=normal.cdf(sign * a),
+        cdf_d2=normal.cdf(sign * b),
+    )
+
+
+def _price(x: _BatchTerms) -> np.ndarray:
+    return x.sign * (x.s * x.disc_q * x.cdf_d1 - x.k * x.disc_r * x.cdf_d2)
+
+
+def _delta(x: _BatchTerms) -> np.ndarray:
+    return x.sign * x.disc_q * x.cdf_d1
+
+
+def _gamma(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g = x.disc_q * x.pdf_d1 / (x.s * x.sd)
+    return np.where(x.degenerate, 0.0, g)
+
+
+def _vega(x: _BatchTerms) -> np.ndarray:
+    return x.s * x.disc_q * x.pdf_d1 * x.sqrt_t
+
+
+def _theta(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        term1 = -(x.s * x.v * x.disc_q * x.pdf_d1) / (2 * x.sqrt_t)
+    term1 = np.where(x.degenerate, 0.0, term1)
+    return term1 + x.sign * (
+        x.q * x.s * x.disc_q * x.cdf_d1 - x.r * x.k * x.disc_r * x.cdf_d2
+    )
+
+
+def _rho(x: _BatchTerms) -> np.ndarray:
+    return x.sign * x.k * x.t * x.disc_r * x.cdf_d2
+
+
+def _vanna(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        va = -x.disc_q * x.pdf_d1 * x.d2 / x.v
+    return np.where(x.degenerate, 0.0, va)
+
+
+def _volga(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vo = _vega(x) * x.d1 * x.d2 / x.v
+    return np.where(x.degenerate, 0.0, vo)
+
+
+def _charm(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decay = (
+            x.disc_q
+            * x.pdf_d1
+            * (2 * (x.r - x.q) * x.t - x.d2 * x.sd)
+            / (2 * x.t * x.sd)
+        )
+    decay = np.where(x.degenerate, 0.0, decay)
+    return x.sign * x.q * x.disc_q * x.cdf_d1 - decay
+
+
+def _speed(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sp = -_gamma(x) / x.s * (x.d1 / x.sd + 1)
+    return np.where(x.degenerate, 0.0, sp)
+
+
+def _color(x: _BatchTerms) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        co = (
+            x.disc_q
+            * x.pdf_d1
+            / (2 * x.s * x.t * x.sd)
+            * (
+                2 * x.q * x.t
+                + 1
+                + (2 * (x.r - x.q) * x.t - x.d2 * x.sd) / x.sd * x.d1
+            )
+        )
+    return np.where(x.degenerate, 0.0, co)
+
+
+def batch_price(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+) -> np.ndarray:
+    """Black-Scholes prices over arrays
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+
+    Returns:
+        np.ndarray: Black-Scholes prices with the broadcast shape of the inputs
+    """
+    return _price(_batch_terms(s, k, r, q, v, t, is_call))
+
+
+def batch_delta(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+) -> np.ndarray:
+    """Black-Scholes deltas over arrays
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+
+    Returns:
+        np.ndarray: Black-Scholes deltas with the broadcast shape of the inputs
+    """
+    return _delta(_batch_terms(s, k, r, q, v, t, is_call))
+
+
+def batch_gamma(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+) -> np.ndarray:
+    """Black-Scholes gammas over arrays
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+
+    Returns:
+        np.ndarray: Black-Scholes gammas, zero where expired or zero volatility
+    """
+    return _gamma(_batch_terms(s, k, r, q, v, t))
+
+
+def batch_vega(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+) -> np.ndarray:
+    """Black-Scholes vegas over arrays
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+
+    Returns:
+        np.ndarray: Black-Scholes vegas, zero where expired or zero volatility
+    """
+    return _vega(_batch_terms(s, k, r, q, v, t))
+
+
+def batch_theta(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+) -> np.ndarray:
+    """Black-Scholes thetas over arrays
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+
+    Returns:
+        np.ndarray: Black-Scholes thetas with the broadcast shape of the inputs
+    """
+    return _theta(_batch_terms(s, k, r, q, v, t, is_call))
+
+
+def batch_rho(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+) -> np.ndarray:
+    """Black-Scholes rhos over arrays
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+
+    Returns:
+        np.ndarray: Black-Scholes rhos with the broadcast shape of the inputs
+    """
+    return _rho(_batch_terms(s, k, r, q, v, t, is_call))
+
+
+def batch_greeks(
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+    higher_order: bool = False,
+) -> BatchGreeks:
+    """Black-Scholes price and Greeks over arrays in a single fused pass
+
+    Args:
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        v (ArrayLike): return volatilities
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+        higher_order (bool, optional): if True also compute vanna, volga,
+        charm, speed and color from the same intermediates. Defaults to False.
+
+    Returns:
+        BatchGreeks: prices and Greeks with the broadcast shape of the inputs
+    """
+    x = _batch_terms(s, k, r, q, v, t, is_call)
+
+    greeks = BatchGreeks(
+        price=_price(x),
+        delta=_delta(x),
+        gamma=_gamma(x),
+        vega=_vega(x),
+        theta=_theta(x),
+        rho=_rho(x),
+    )
+    if higher_order:
+        greeks.vanna = _vanna(x)
+        greeks.volga = _volga(x)
+        greeks.charm = _charm(x)
+        greeks.speed = _speed(x)
+        greeks.color = _color(x)
+    return greeks
+
+
+def batch_black76_greeks(
+    f: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    v: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+    higher_order: bool = False,
+) -> BatchGreeks:
+    """Black-76 price and Greeks of options on futures over arrays
+
+    Black-76 is Black-Scholes on the futures price with a dividend yield equal
+    to the risk free rate, so it shares the fused kernel of batch_greeks. Delta
+    and gamma are with respect to the futures price, and rho holds the futures
+    price fixed.
+
+    Args:
+        f (ArrayLike): underlying futures prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        v (ArrayLike): futures return volatilities
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+        higher_order (bool, optional): see batch_greeks. Defaults to False.
+
+    Returns:
+        BatchGreeks: prices and Greeks with the broadcast shape of the inputs
+    """
+    greeks = batch_greeks(f, k, r, r, v, t, is_call, higher_order)
+    greeks.rho = -np.maximum(t, 0.0) * greeks.price
+    return greeks
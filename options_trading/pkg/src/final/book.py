@@ -0,0 +1,260 @@
+"""
+Columnar options book with vectorized risk aggregation
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from final import blackscholes as bs
+from final.dividends import DividendSchedule
+
+
+@dataclass
+class BookRisk:
+    """Storage class for aggregated dollar Greeks
+
+    Every field is indexed by underlying id, and additionally by expiry bucket
+    when produced by OptionBook.bucket_risk.
+    """
+
+    value: np.ndarray
+    """Mark-to-model value"""
+    dollar_delta: np.ndarray
+    """P&L for a 100% move in spot, i.e. sum of quantity * delta * spot"""
+    dollar_gamma: np.ndarray
+    """Change in dollar delta for a 1% move in spot"""
+    vega: np.ndarray
+    """P&L for a 1 vol point move"""
+    theta: np.ndarray
+    """P&L for one calendar day"""
+    rho: np.ndarray
+    """P&L for a 1% move in the risk free rate"""
+
+
+class OptionBook:
+    """Positions in European options stored column-wise, one row per position
+
+    Options on futures (is_future) are priced with Black-76, taking the spot
+    of their underlying id to be the futures price. Options on stocks are
+    priced with Black-Scholes, on the spot net of escrowed dividends when a
+    DividendSchedule is given, so a mixed book is still one batched call.
+    """
+
+    def __init__(
+        self,
+        strike: npt.ArrayLike,
+        expiry: npt.ArrayLike,
+        quantity: npt.ArrayLike,
+        is_call: npt.ArrayLike,
+        underlying: npt.ArrayLike,
+        multiplier: npt.ArrayLike = 1.0,
+        is_future: npt.ArrayLike = False,
+    ) -> None:
+        """Initializer
+
+        Args:
+            strike (ArrayLike): strike prices
+            expiry (ArrayLike): times to expiry
+            quantity (ArrayLike): signed number of contracts
+            is_call (ArrayLike): boolean mask, True for calls and False for puts
+            underlying (ArrayLike): integer underlying ids, 0 to num_underlyings - 1
+            multiplier (ArrayLike, optional): contract multipliers. Defaults to 1.
+            is_future (ArrayLike, optional): boolean mask, True for options on
+            futures. Defaults to False.
+        """
+        strike, expiry, quantity, multiplier = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (strike, expiry, quantity, multiplier))
+        )
+        self.strike = strike
+        self.expiry = expiry
+        self.quantity = quantity
+        self.multiplier = multiplier
+        self.is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), strike.shape)
+        self.underlying = np.broadcast_to(np.asarray(underlying, dtype=np.intp), strike.shape)
+        self.is_future = np.broadcast_to(np.asarray(is_future, dtype=bool), strike.shape)
+        self.num_underlyings = int(self.underlying.max()) + 1 if self.underlying.size else 0
+
+    def __len__(self) -> int:
+        return self.strike.size
+
+    def subset(self, index: npt.ArrayLike) -> "OptionBook":
+        """A new book holding the selected positions, underlying ids unchanged
+
+        Args:
+            index (ArrayLike): position indices or boolean mask
+
+        Returns:
+            OptionBook: the selected positions
+        """
+        return OptionBook(
+            strike=self.strike[index],
+            expiry=self.expiry[index],
+            quantity=self.quantity[index],
+            is_call=self.is_call[index],
+            underlying=self.underlying[index],
+            multiplier=self.multiplier[index],
+            is_future=self.is_future[index],
+        )
+
+    def greeks(
+        self,
+        spot: npt.ArrayLike,
+        vol: npt.ArrayLike,
+        rate: npt.ArrayLike,
+        dividend_yield: npt.ArrayLike = 0.0,
+        dividends: DividendSchedule | None = None,
+    ) -> bs.BatchGreeks:
+        """Per-contract price and Greeks
+
+        Args:
+            spot (ArrayLike): spot (or futures) price per underlying id
+            vol (ArrayLike): volatility, scalar or one per position
+            rate (ArrayLike): risk free rate, scalar or one per position
+            dividend_yield (ArrayLike, optional): dividend yield per underlying
+            id. Defaults to 0.
+            dividends (DividendSchedule | None, optional): discrete dividends
+            escrowed out of the spot of non-futures positions. Defaults to None.
+
+        Returns:
+            bs.BatchGreeks: prices and Greeks of a single contract per position
+        """
+        s, q = self.adjusted_inputs(spot, rate, dividend_yield, dividends)
+        greeks = bs.batch_greeks(s, self.strike, rate, q, vol, self.expiry, self.is_call)
+        if self.is_future.any():
+            greeks.rho = np.where(
+                self.is_future, -np.maximum(self.expiry, 0.0) * greeks.price, greeks.rho
+            )
+        return greeks
+
+    def adjusted_inputs(
+        self,
+        spot: npt.ArrayLike,
+        rate: npt.ArrayLike,
+        dividend_yield: npt.ArrayLike = 0.0,
+        dividends: DividendSchedule | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Per-position Black-Scholes spot and dividend yield
+
+        Futures positions get a dividend yield equal to the risk free rate
+        (Black-76) and stock positions the spot net of escrowed dividends.
+
+        Args:
+            spot (ArrayLike): spot (or futures) price per underlying id
+            rate (ArrayLike): risk free rate, scalar or one per position
+            dividend_yield (ArrayLike, optional): dividend yield per underlying
+            id. Defaults to 0.
+            dividends (DividendSchedule | None, optional): discrete dividends
+            escrowed out of the spot of non-futures positions. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: spot and dividend yield per position
+        """
+        s = self.per_position(spot)
+        q = self.per_position(dividend_yield)
+        if dividends is not None:
+            pv = dividends.pv(self.underlying, self.expiry)
+            s = s - np.where(self.is_future, 0.0, pv)
+        if self.is_future.any():
+            q = np.where(self.is_future, rate, q)
+        return s, q
+
+    def per_position(self, per_underlying: npt.ArrayLike) -> np.ndarray:
+        """Gather per-underlying values onto positions
+
+        Args:
+            per_underlying (ArrayLike): scalar, or array indexed by underlying id
+
+        Returns:
+            np.ndarray: one value per position, or the scalar unchanged
+        """
+        a = np.asarray(per_underlying, dtype=float)
+        return a[self.underlying] if a.ndim else a
+
+    def _dollar_greeks(
+        self, spot: npt.ArrayLike, greeks: bs.BatchGreeks
+    ) -> list[np.ndarray]:
+        """Position-level dollar Greeks in BookRisk field order"""
+        s = self.per_position(spot)
+        size = self.quantity * self.multiplier
+        return [
+            size * greeks.price,
+            size * greeks.delta * s,
+            size * greeks.gamma * s**2 / 100,
+            size * greeks.vega / 100,
+            size * greeks.theta / 365,
+            size * greeks.rho / 100,
+        ]
+
+    def risk(
+        self,
+        spot: npt.ArrayLike,
+        vol: npt.ArrayLike,
+        rate: npt.ArrayLike,
+        dividend_yield: npt.ArrayLike = 0.0,
+        dividends: DividendSchedule | None = None,
+    ) -> BookRisk:
+        """Dollar Greeks aggregated per underlying
+
+        Args:
+            spot (ArrayLike): spot price per underlying id
+            vol (ArrayLike): volatility, scalar or one per position
+            rate (ArrayLike): risk free rate, scalar or one per position
+            dividend_yield (ArrayLike, optional): dividend yield per underlying
+            id. Defaults to 0.
+            dividends (DividendSchedule | None, optional): see greeks.
+            Defaults to None.
+
+        Returns:
+            BookRisk: fields of shape (num_underlyings,)
+        """
+        greeks = self.greeks(spot, vol, rate, dividend_yield, dividends)
+        columns = self._dollar_greeks(spot, greeks)
+        return BookRisk(
+            *(
+                np.bincount(self.underlying, weights=c, minlength=self.num_underlyings)
+                for c in columns
+            )
+        )
+
+    def bucket_risk(
+        self,
+        spot: npt.ArrayLike,
+        vol: npt.ArrayLike,
+        rate: npt.ArrayLike,
+        dividend_yield: npt.ArrayLike = 0.0,
+        dividends: DividendSchedule | None = None,
+        *,
+        bucket_edges: npt.ArrayLike,
+    ) -> BookRisk:
+        """Dollar Greeks aggregated per underlying and expiry bucket
+
+        Args:
+            spot (ArrayLike): spot price per underlying id
+            vol (ArrayLike): volatility, scalar or one per position
+            rate (ArrayLike): risk free rate, scalar or one per position
+            dividend_yield (ArrayLike, optional): dividend yield per underlying
+            id. Defaults to 0.
+            dividends (DividendSchedule | None, optional): see greeks.
+            Defaults to None.
+            bucket_edges (ArrayLike): increasing inner bucket edges in years,
+            e.g. [0.25, 1.0] for buckets (-inf, 0.25), [0.25, 1.0), [1.0, inf)
+
+        Returns:
+            BookRisk: fields of shape (num_underlyings, len(bucket_edges) + 1)
+        """
+        edges = np.asarray(bucket_edges, dtype=float)
+        num_buckets = edges.size + 1
+        bucket = np.searchsorted(edges, self.expiry, side="right")
+        group = self.underlying * num_buckets + bucket
+        shape = (self.num_underlyings, num_buckets)
+
+        greeks = self.greeks(spot, vol, rate, dividend_yield, dividends)
+        columns = self._dollar_greeks(spot, greeks)
+        return BookRisk(
+            *(
+                np.bincount(group, weights=c, minlength=shape[0] * shape[1]).reshape(shape)
+                for c in columns
+            )
+        )
@@ -0,0 +1,131 @@
+"""
+Opt-in memoization of the scalar Black-Scholes functions
+"""
+
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from final import blackscholes as bs
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, mirroring functools.lru_cache"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class PricingCache:
+    """Bounded LRU cache in front of the scalar Black-Scholes functions
+
+    Inputs are rounded to `decimals` places before lookup, so that repeated
+    requests for nearly identical contracts within a tick share one entry.
+    Values are always computed from the rounded inputs, which keeps results
+    independent of the order in which requests arrive.
+
+    Example:
+        cache = PricingCache(decimals=6)
+        cache.price(100.0, 95.0, 0.04, 0.01, 0.2, 0.5, is_call=True)
+        cache.invalidate(v=0.2)  # the vol input changed, drop stale entries
+    """
+
+    def __init__(self, maxsize: int = 100_000, decimals: int = 8) -> None:
+        """Initializer
+
+        Args:
+            maxsize (int, optional): maximum number of cached values before the
+            least recently used ones are evicted. Defaults to 100,000.
+            decimals (int, optional): number of decimal places inputs are
+            rounded to. Defaults to 8.
+        """
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, float] = OrderedDict()
+
+    def _lookup(self, func: Callable[..., float], *args) -> float:
+        key = (func.__name__,) + tuple(
+            round(a, self.decimals) if not isinstance(a, bool) else a for a in args
+        )
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = func(*key[1:])
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def price(
+        self, s: float, k: float, r: float, q: float, v: float, t: float, is_call: bool
+    ) -> float:
+        """Cached Black-Scholes price, see blackscholes.price"""
+        return self._lookup(bs.price, s, k, r, q, v, t, bool(is_call))
+
+    def delta(
+        self, s: float, k: float, r: float, q: float, v: float, t: float, is_call: bool
+    ) -> float:
+        """Cached Black-Scholes delta, see blackscholes.delta"""
+        return self._lookup(bs.delta, s, k, r, q, v, t, bool(is_call))
+
+    def theta(
+        self, s: float, k: float, r: float, q: float, v: float, t: float, is_call: bool
+    ) -> float:
+        """Cached Black-Scholes theta, see blackscholes.theta"""
+        return self._lookup(bs.theta, s, k, r, q, v, t, bool(is_call))
+
+    def gamma(self, s: float, k: float, r: float, q: float, v: float, t: float) -> float:
+        """Cached Black-Scholes gamma, see blackscholes.gamma"""
+        return self._lookup(bs.gamma, s, k, r, q, v, t)
+
+    def vega(self, s: float, k: float, r: float, q: float, v: float, t: float) -> float:
+        """Cached Black-Scholes vega, see blackscholes.vega"""
+        return self._lookup(bs.vega, s, k, r, q, v, t)
+
+    def invalidate(
+        self, r: float | None = None, q: float | None = None, v: float | None = None
+    ) -> int:
+        """Drop the entries priced with the given market inputs
+
+        Entries match when every given input equals theirs after rounding, so
+        invalidate(v=0.2) drops everything priced at a 20% vol. With no
+        arguments the whole cache is cleared.
+
+        Args:
+            r (float | None, optional): risk free rate to drop. Defaults to None.
+            q (float | None, optional): dividend yield to drop. Defaults to None.
+            v (float | None, optional): volatility to drop. Defaults to None.
+
+        Returns:
+            int: number of entries dropped
+        """
+        # Keys are (name, s, k, r, q, v, t[, is_call])
+        match = {
+            pos: round(x, self.decimals)
+            for pos, x in ((3, r), (4, q), (5, v))
+            if x is not None
+        }
+        if not match:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+
+        stale = [
+            key
+            for key in self._entries
+            if all(key[pos] == x for pos, x in match.items())
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def cache_info(self) -> CacheInfo:
+        """Hit/miss counters and current size"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
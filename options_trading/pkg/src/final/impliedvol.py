@@ -0,0 +1,139 @@
+"""
+Implied volatility inversion of the Black-Scholes formulae over arrays
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from final import blackscholes as bs
+
+MIN_VOL = 1e-6
+"""Smallest volatility the solver will return"""
+
+
+def initial_guess(
+    price: np.ndarray,
+    s: np.ndarray,
+    k: np.ndarray,
+    r: np.ndarray,
+    q: np.ndarray,
+    t: np.ndarray,
+    is_call: np.ndarray,
+) -> np.ndarray:
+    """Corrado-Miller rational approximation of the implied volatility
+
+    Puts are first mapped to calls through put-call parity. Where the
+    approximation breaks down (negative discriminant far from the money) the
+    Brenner-Subrahmanyam at-the-money estimate is used instead.
+
+    Args:
+        price (np.ndarray): option prices
+        s (np.ndarray): underlying spot prices
+        k (np.ndarray): strike prices
+        r (np.ndarray): continuous risk free rates
+        q (np.ndarray): continuous dividend yields
+        t (np.ndarray): times to expiry, strictly positive
+        is_call (np.ndarray): boolean mask, True for calls and False for puts
+
+    Returns:
+        np.ndarray: volatility guesses
+    """
+    fwd = s * np.exp(-q * t)
+    strike = k * np.exp(-r * t)
+    call = np.where(is_call, price, price + fwd - strike)
+
+    half = 0.5 * (fwd - strike)
+    disc = np.maximum((call - half) ** 2 - (fwd - strike) ** 2 / np.pi, 0.0)
+    total = np.sqrt(2 * np.pi) / (fwd + strike) * (call - half + np.sqrt(disc))
+    atm = np.sqrt(2 * np.pi) * call / fwd
+    total = np.where(total > 0, total, atm)
+
+    return np.clip(total / np.sqrt(t), 0.01, 5.0)
+
+
+def implied_volatility(
+    price: npt.ArrayLike,
+    s: npt.ArrayLike,
+    k: npt.ArrayLike,
+    r: npt.ArrayLike,
+    q: npt.ArrayLike,
+    t: npt.ArrayLike,
+    is_call: npt.ArrayLike,
+    tol: float = 1e-10,
+    max_iter: int = 50,
+) -> np.ndarray | float:
+    """Black-Scholes implied volatilities over arrays
+
+    Starts from the rational initial_guess and takes Halley steps built from
+    vega and volga, falling back to Newton and then to bisection whenever a
+    step leaves the bracket [lo, hi] that each element maintains around its
+    root. Only the elements that have not yet converged are re-evaluated on
+    each iteration.
+
+    Args:
+        price (ArrayLike): option prices
+        s (ArrayLike): underlying spot prices
+        k (ArrayLike): strike prices
+        r (ArrayLike): continuous risk free rates
+        q (ArrayLike): continuous dividend yields
+        t (ArrayLike): times to expiry
+        is_call (ArrayLike): boolean mask, True for calls and False for puts
+        tol (float, optional): absolute price tolerance. Defaults to 1e-10.
+        max_iter (int, optional): maximum number of iterations. Defaults to 50.
+
+    Returns:
+        np.ndarray | float: implied volatilities, NaN where the price violates
+        the no-arbitrage bounds (including prices without time value), the
+        option has expired or the solver did not converge. A scalar for scalar
+        inputs, like the batch pricing functions.
+    """
+    price, s, k, r, q, t = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (price, s, k, r, q, t))
+    )
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), price.shape)
+
+    fwd = s * np.exp(-q * t)
+    strike = k * np.exp(-r * t)
+    lower = np.maximum(np.where(is_call, fwd - strike, strike - fwd), 0.0)
+    upper = np.where(is_call, fwd, strike)
+    valid = (t > 0) & (price > lower) & (price < upper)
+
+    vol = np.full(price.shape, np.nan)
+    idx = np.flatnonzero(valid)
+    price, s, k, r, q, t, is_call = (
+        a.ravel()[idx] for a in (price, s, k, r, q, t, is_call)
+    )
+    x = initial_guess(price, s, k, r, q, t, is_call)
+    lo = np.full(x.shape, MIN_VOL)
+    hi = np.full(x.shape, np.inf)
+
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+
+        terms = bs._batch_terms(s, k, r, q, x, t, is_call)
+        diff = bs._price(terms) - price
+        vega = bs._vega(terms)
+
+        lo = np.where(diff < 0, x, lo)
+        hi = np.where(diff > 0, x, hi)
+
+        done = (np.abs(diff) < tol) | (hi - lo < tol)
+        vol.flat[idx[done]] = x[done]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = diff / vega
+            volga = vega * terms.d1 * terms.d2 / x
+            halley = newton / (1 - 0.5 * newton * volga / vega)
+        step = np.where(np.isfinite(halley), halley, newton)
+        nxt = x - step
+        bisect = np.where(np.isinf(hi), 2 * x, 0.5 * (lo + hi))
+        nxt = np.where(np.isfinite(nxt) & (nxt > lo) & (nxt < hi), nxt, bisect)
+
+        keep = ~done
+        idx, price, s, k, r, q, t, is_call, lo, hi = (
+            a[keep] for a in (idx, price, s, k, r, q, t, is_call, lo, hi)
+        )
+        x = nxt[keep]
+
+    return vol[()]
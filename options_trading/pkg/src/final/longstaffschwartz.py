@@ -3,9 +3,10 @@ Implementation of the Longstaff-Schwartz LSM model
 """
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
+from scipy import linalg
 
 from final.random import Paths, PathGenerator
 
@@ -33,6 +34,84 @@ class LSMTimeStepData:
     """Fitted discounted continuation values"""
 
 
+# Regression bases map the ITM prices x, the polynomial degree and the strike
+# to a (len(x), num_functions) design matrix
+
+
+def monomial_basis(x: np.ndarray, degree: int, strike: float) -> np.ndarray:
+    """Raw powers 1, x, ..., x^degree, as in the reference paper"""
+    return np.column_stack([x**i for i in range(degree + 1)])
+
+
+def scaled_monomial_basis(x: np.ndarray, degree: int, strike: float) -> np.ndarray:
+    """Powers of the moneyness x / strike, which keeps columns of order 1"""
+    return np.polynomial.polynomial.polyvander(x / strike, degree)
+
+
+def laguerre_basis(x: np.ndarray, degree: int, strike: float) -> np.ndarray:
+    """Weighted Laguerre polynomials exp(-m / 2) L_n(m) of the moneyness
+    m = x / strike, the basis proposed by Longstaff and Schwartz"""
+    m = x / strike
+    return np.exp(-0.5 * m)[:, None] * np.polynomial.laguerre.lagvander(m, degree)
+
+
+def hermite_basis(x: np.ndarray, degree: int, strike: float) -> np.ndarray:
+    """Probabilists' Hermite polynomials of the standardized prices, close to
+    orthogonal for roughly normal x"""
+    std = x.std()
+    z = (x - x.mean()) / (std if std > 0 else 1.0)
+    return np.polynomial.hermite_e.hermevander(z, degree)
+
+
+BASES: dict[str, Callable[[np.ndarray, int, float], np.ndarray]] = {
+    "monomial": monomial_basis,
+    "scaled_monomial": scaled_monomial_basis,
+    "laguerre": laguerre_basis,
+    "hermite": hermite_basis,
+}
+"""Regression bases selectable by name in lsm_price"""
+
+
+# Solvers map a design matrix and regressand to the least squares coefficients
+
+
+def lstsq_solver(a: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """SVD based least squares, robust to rank deficiency"""
+    return np.linalg.lstsq(a, y, rcond=None)[0]
+
+
+def normal_solver(a: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Cholesky solve of the k x k normal equations, the fastest option for
+    a well conditioned basis. Falls back to lstsq if the Gram matrix is not
+    numerically positive definite."""
+    try:
+        return linalg.cho_solve(linalg.cho_factor(a.T @ a), a.T @ y)
+    except linalg.LinAlgError:
+        return lstsq_solver(a, y)
+
+
+def qr_solver(a: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Householder QR, more accurate than the normal equations as it does
+    not square the condition number. Q is applied to y without being formed.
+    Falls back to lstsq if there are fewer rows than basis functions or R is
+    singular."""
+    if a.shape[0] < a.shape[1]:
+        return lstsq_solver(a, y)
+    qty, r = linalg.qr_multiply(a, y, mode="right")
+    try:
+        return linalg.solve_triangular(r, qty)
+    except linalg.LinAlgError:
+        return lstsq_solver(a, y)
+
+
+SOLVERS: dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "lstsq": lstsq_solver,
+    "normal": normal_solver,
+    "qr": qr_solver,
+}
+"""Least squares solvers selectable by name in lsm_price"""
+
+
 def lsm_price(
     strike_price: float,
     risk_free_rate: float,
@@ -40,6 +119,8 @@ def lsm_price(
     path_generator: PathGenerator,
     polynomial_degree: int = 2,
     debug: bool = False,
+    basis: str | Callable[[np.ndarray, int, float], np.ndarray] = "monomial",
+    solver: str | Callable[[np.ndarray, np.ndarray], np.ndarray] = "lstsq",
 ) -> float | tuple[float, list[LSMTimeStepData]]:
     """The Longstaff-Schwartz Least Squares Monte Carlo American option price
 
@@ -52,6 +133,13 @@ def lsm_price(
         regression. Defaults to 2, as is in the reference paper.
         debug (bool, optional): if True will return additional output with debug
         info. Defaults to False.
+        basis (str | Callable, optional): regression basis, a name in BASES or
+        a function (x, degree, strike) -> design matrix. b_hat in the debug
+        output holds coefficients in this basis. Defaults to "monomial", as
+        in the reference paper.
+        solver (str | Callable, optional): least squares solver, a name in
+        SOLVERS or a function (design matrix, y) -> coefficients. Defaults
+        to "lstsq".
 
     Returns:
         float | tuple[float, list[LSMTimeStepData]]: the option price and optionally some debug output
@@ -59,20 +147,26 @@ def lsm_price(
 
     # Your implementation
 
+    basis = BASES[basis] if isinstance(basis, str) else basis
+    solver = SOLVERS[solver] if isinstance(solver, str) else solver
+
     paths = path_generator.generate()
     
     num_steps = paths.shape[1] - 1
 
-    time_step = paths.time_step
-    
-    # Initializing the cashflow matrix
-    cashflows = np.zeros_like(paths[:])
-    
-    # Terminal payoffs
+    # Column times rather than multiples of time_step, so that paths observed
+    # on unevenly spaced dates are discounted correctly
+    times = paths.times
+
+    # Every path has at most one cashflow, at its stopping time, so instead of
+    # a cashflow matrix that is rescanned at each date we keep one realized
+    # cashflow and one stopping index per path, making each backward step
+    # O(paths) rather than O(paths x remaining steps)
     if is_call:
-        cashflows[:, -1] = np.maximum(paths[:, -1] - strike_price, 0)
+        cashflow = np.maximum(paths[:, -1] - strike_price, 0)
     else:
-        cashflows[:, -1] = np.maximum(strike_price - paths[:, -1], 0)
+        cashflow = np.maximum(strike_price - paths[:, -1], 0)
+    stopping_time = np.full(paths.shape[0], times[-1])
     
     debug_data = []
     
@@ -80,7 +174,7 @@ def lsm_price(
     for j in range(num_steps - 1, 0, -1):
 
         # Current time
-        t_j = j * time_step
+        t_j = times[j]
         
         # Calculate immediate exercise value
         if is_call:
@@ -95,33 +189,29 @@ def lsm_price(
             # Get price paths and continuation values for ITM paths
             x = paths[itm_indices, j]
             
-            # Future cashflows
-            future_cf = cashflows[itm_indices, j+1:]
-            discount_factors = np.exp(-risk_free_rate * np.arange(1, num_steps-j+1) * time_step)
-            y = np.sum(future_cf * discount_factors, axis=1)
+            # Realized future cashflows discounted back to t_j
+            y = cashflow[itm_indices] * np.exp(-risk_free_rate * (stopping_time[itm_indices] - t_j))
             
-            # Setup basis functions (polynomial terms)
-            x_mat = np.column_stack([x**i for i in range(polynomial_degree + 1)])
+            # Setup basis functions
+            x_mat = basis(x, polynomial_degree, strike_price)
             
             # Regression
-            b_hat = np.linalg.lstsq(x_mat, y, rcond=None)[0]
+            b_hat = solver(x_mat, y)
             continuation_value = x_mat @ b_hat
             
             # Exercise decision
             exercise = exercise_value[itm_indices] > continuation_value
             
-            # Update cashflows matrix
-            cashflows[itm_indices, j] = np.where(exercise, exercise_value[itm_indices],0)
-            
-            # Zero out future cashflows where we exercise now
-            cashflows[itm_indices[exercise], j+1:] = 0
+            # Exercising now replaces the path's later cashflow
+            exercised = itm_indices[exercise]
+            cashflow[exercised] = exercise_value[exercised]
+            stopping_time[exercised] = t_j
             
             if debug:
                 debug_data.append(LSMTimeStepData(j=j, t_j=t_j, po_plus=exercise_value[itm_indices], b_hat=b_hat.tolist(), x=x, y=y, y_hat=continuation_value))
     
     # Price is the average of discounted cashflows
-    discount_factors = np.exp(-risk_free_rate * np.arange(num_steps + 1) * time_step)
-    option_price = np.mean(np.sum(cashflows * discount_factors, axis=1))
+    option_price = np.mean(cashflow * np.exp(-risk_free_rate * stopping_time))
     
     if debug:
         return option_price, debug_data
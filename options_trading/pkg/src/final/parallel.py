@@ -0,0 +1,131 @@
+"""
+Multi-process Monte Carlo over independent, reproducible RNG streams
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable
+
+import numpy as np
+
+from final.random import PathGenerator, Paths, SampleMoments, SharedPaths
+
+# Work is always split into the same blocks, block i drawing from the child
+# stream i of the generator's SeedSequence (see PathGenerator.generate_chunk).
+# Workers only decide who computes which block, and partial results are
+# combined in block order, so a seed gives bit-identical results whatever the
+# number of workers.
+#
+# Workers are spawned rather than forked: forking a process whose numba (or
+# BLAS) thread pool is already running can deadlock the children.
+
+
+def _map(func: Callable, items: Iterable, num_workers: int | None) -> list:
+    """Ordered map, in a process pool unless a single worker is requested"""
+    items = list(items)
+    num_workers = min(num_workers or os.cpu_count() or 1, len(items))
+    if num_workers <= 1:
+        return [func(item) for item in items]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as pool:
+        return list(pool.map(func, items))
+
+
+def _reduce_chunk(
+    index: int,
+    path_generator: PathGenerator,
+    chunk_size: int,
+    func: Callable[[Paths], np.ndarray],
+) -> SampleMoments:
+    paths = path_generator.generate_chunk(index, chunk_size)
+    return SampleMoments.of(func(paths), path_generator.antithetic)
+
+
+def _fill_chunk(
+    index: int, path_generator: PathGenerator, chunk_size: int, name: str, memmap: bool
+) -> None:
+    out = SharedPaths(name, memmap)
+    start = index * chunk_size
+    block = path_generator.generate_chunk(index, chunk_size)
+    out[start : start + block.num_paths] = block[:]
+    out.close()
+
+
+def parallel_generate(
+    path_generator: PathGenerator,
+    chunk_size: int,
+    num_workers: int | None = None,
+    out: SharedPaths | None = None,
+) -> Paths:
+    """Generate all the paths of a generator across a process pool
+
+    Args:
+        path_generator (PathGenerator): a generator supporting generate_chunk
+        chunk_size (int): number of paths per block of work
+        num_workers (int | None, optional): number of processes. Defaults to
+        the number of CPUs.
+        out (SharedPaths | None, optional): shared paths of the right shape
+        that the workers write their blocks into directly, instead of sending
+        them back. Defaults to None.
+
+    Returns:
+        Paths: the blocks concatenated in order, identical to concatenating
+        path_generator.generate_chunks(chunk_size), or out if given
+    """
+    if out is not None:
+        if out.shape != (path_generator.num_paths, path_generator.num_steps + 1):
+            raise ValueError(f"out has shape {out.shape}, expected the generator's paths")
+        _map(
+            partial(
+                _fill_chunk,
+                path_generator=path_generator,
+                chunk_size=chunk_size,
+                name=out.name,
+                memmap=out.memmap,
+            ),
+            range(path_generator.num_chunks(chunk_size)),
+            num_workers,
+        )
+        return out
+
+    blocks = _map(
+        partial(path_generator.generate_chunk, chunk_size=chunk_size),
+        range(path_generator.num_chunks(chunk_size)),
+        num_workers,
+    )
+    return type(blocks[0]).concatenate(blocks)
+
+
+def parallel_mean(
+    path_generator: PathGenerator,
+    func: Callable[[Paths], np.ndarray],
+    chunk_size: int,
+    num_workers: int | None = None,
+) -> tuple[float, float]:
+    """Monte Carlo estimate with per-block partial reductions in workers
+
+    Only the SampleMoments of each block travel back from the workers, never
+    the paths themselves.
+
+    Args:
+        path_generator (PathGenerator): a generator supporting generate_chunk
+        func (Callable[[Paths], np.ndarray]): maps a block of paths to one
+        sample per path, must be picklable (e.g. a module level function)
+        chunk_size (int): number of paths per block of work
+        num_workers (int | None, optional): number of processes. Defaults to
+        the number of CPUs.
+
+    Returns:
+        tuple[float, float]: the sample mean and its standard error
+    """
+    partials = _map(
+        partial(_reduce_chunk, path_generator=path_generator, chunk_size=chunk_size, func=func),
+        range(path_generator.num_chunks(chunk_size)),
+        num_workers,
+    )
+    moments = SampleMoments()
+    for p in partials:
+        moments = moments.merge(p)
+    return moments.mean, moments.stderr
@@ -0,0 +1,192 @@
+"""
+Content-addressed caching and replay of Monte Carlo shocks and paths
+"""
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from final.cache import CacheInfo
+from final.random import GBMPathGenerator, Paths, StandardNormalRNG
+
+
+class _ReplayRNG(StandardNormalRNG):
+    """Serves cached normals through the StandardNormalRNG interface"""
+
+    def __init__(self, normals: np.ndarray) -> None:
+        self.normals = normals
+        self._next_row = 0
+
+    def vector(self, size: int) -> np.ndarray:
+        self._next_row += 1
+        return self.normals[self._next_row - 1]
+
+    def matrix(self, rows: int, cols: int) -> np.ndarray:
+        return self.normals
+
+
+class PathCache:
+    """Size-bounded LRU cache of normal draws and unit GBM paths
+
+    Entries are addressed by a hash of their content's inputs: the exact
+    state of the NumPy bit generator before the draw, the shape, and for
+    paths the model parameters. A hit restores the generator to the state it
+    would have after drawing, so cached and uncached runs stay in lockstep.
+
+    Paths are stored for s0 = 1 and rescaled on the way out, so a run with a
+    bumped s0 costs a single multiplication, and a run with a bumped drift or
+    diffusion reuses the cached normals. Results equal uncached generation up
+    to floating point rounding.
+
+    Entries evicted from memory are spilled to .npy files in spill_dir when
+    given, and read back as memory maps. Spilled files are kept until clear().
+
+    Example:
+        cache = PathCache(max_bytes=2**30)
+        base = cache.generate(generator)
+        generator.s0 *= 1.01
+        bumped = cache.generate(generator)  # rescaled, nothing redrawn
+    """
+
+    def __init__(self, max_bytes: int = 2**30, spill_dir: str | Path | None = None) -> None:
+        """Initializer
+
+        Args:
+            max_bytes (int, optional): memory bound on the cached arrays.
+            Defaults to 1 GiB.
+            spill_dir (str | Path | None, optional): directory to spill evicted
+            entries to. Defaults to None, evicted entries are dropped.
+        """
+        self.max_bytes = max_bytes
+        self.spill_dir = None if spill_dir is None else Path(spill_dir)
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[np.ndarray, dict]] = OrderedDict()
+        self._spilled: dict[str, dict] = {}
+        self._bytes = 0
+
+    @staticmethod
+    def _key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _get(self, key: str) -> tuple[np.ndarray, dict] | None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if key in self._spilled:
+            return np.load(self.spill_dir / f"{key}.npy", mmap_mode="r"), self._spilled[key]
+        return None
+
+    def _put(self, key: str, array: np.ndarray, state: dict) -> None:
+        array.flags.writeable = False
+        if array.nbytes > self.max_bytes:
+            self._spill(key, array, state)
+            return
+        self._entries[key] = (array, state)
+        self._bytes += array.nbytes
+        while self._bytes > self.max_bytes:
+            old_key, (old, old_state) = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+            self._spill(old_key, old, old_state)
+
+    def _spill(self, key: str, array: np.ndarray, state: dict) -> None:
+        if self.spill_dir is not None:
+            np.save(self.spill_dir / f"{key}.npy", array)
+            self._spilled[key] = state
+
+    def normals(self, rng: StandardNormalRNG, rows: int, cols: int) -> np.ndarray:
+        """Cached rng.matrix(rows, cols)
+
+        Subclasses of StandardNormalRNG (e.g. SobolNormalRNG) are passed
+        through uncached, see generate.
+
+        Args:
+            rng (StandardNormalRNG): the generator to draw from, its state
+            addresses the entry and is advanced as by the draw
+            rows (int): number of rows
+            cols (int): number of columns
+
+        Returns:
+            np.ndarray: the normals, to be treated as read only
+        """
+        if type(rng) is not StandardNormalRNG:
+            return rng.matrix(rows, cols)
+
+        bit_generator = rng.rng.bit_generator
+        key = self._key("normals", type(rng).__name__, bit_generator.state, rows, cols)
+        entry = self._get(key)
+        if entry is None:
+            self.misses += 1
+            normals = rng.matrix(rows, cols)
+            self._put(key, normals, bit_generator.state)
+            return normals
+        self.hits += 1
+        normals, bit_generator.state = entry
+        return normals
+
+    def generate(self, generator: GBMPathGenerator, out: np.ndarray | None = None) -> Paths:
+        """Cached GBMPathGenerator.generate
+
+        Generators with other normal generators than StandardNormalRNG (e.g.
+        SobolNormalRNG, whose state lives outside the NumPy bit generator) are
+        passed through uncached.
+
+        Args:
+            generator (GBMPathGenerator): the generator, its rng is advanced
+            as by generate
+            out (np.ndarray | None, optional): see GBMPathGenerator.generate.
+            Defaults to None.
+
+        Returns:
+            Paths: the paths
+        """
+        if type(generator.rng) is not StandardNormalRNG:
+            return generator.generate(out)
+
+        bit_generator = generator.rng.rng.bit_generator
+        key = self._key(
+            "gbm",
+            bit_generator.state,
+            generator.num_paths,
+            generator.num_steps,
+            generator.drift,
+            generator.diffusion,
+            generator.to_time,
+            generator.vectorized,
+            generator.dtype.str,
+        )
+        entry = self._get(key)
+        if entry is None:
+            self.misses += 1
+            z = self.normals(generator.rng, generator.num_steps, generator.num_paths // 2)
+            unit = copy.copy(generator)
+            unit.s0 = 1.0
+            unit.rng = _ReplayRNG(z)
+            paths = unit.generate()[:]
+            self._put(key, paths, bit_generator.state)
+        else:
+            self.hits += 1
+            paths, bit_generator.state = entry
+
+        out = generator._output(generator.num_paths, out)
+        np.multiply(paths, generator.s0, out=out, casting="same_kind")
+        return Paths(time_step=generator.time_step(), data=out)
+
+    def clear(self) -> None:
+        """Drop every entry, deleting spilled files"""
+        for key in self._spilled:
+            (self.spill_dir / f"{key}.npy").unlink(missing_ok=True)
+        self._entries.clear()
+        self._spilled.clear()
+        self._bytes = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Hit and miss statistics, maxsize and currsize being in bytes held
+        in memory"""
+        return CacheInfo(self.hits, self.misses, self.max_bytes, self._bytes)
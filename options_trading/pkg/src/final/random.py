@@ -2,10 +2,16 @@
 Random number generation and simulation
 """
 
+import os
+import sys
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Iterator
 
 import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
 
 
 class StandardNormalRNG:
@@ -27,21 +33,122 @@ class StandardNormalRNG:
         """A random matrix"""
         return self.rng.standard_normal(size=(rows, cols))
 
+    def stream(self, index: int) -> "StandardNormalRNG":
+        """An independent child generator derived from this one's seed
+
+        The child only depends on the seed and index, not on how many numbers
+        have been drawn or children created, so stream(i) is reproducible.
+
+        Args:
+            index (int): child stream number
+
+        Returns:
+            StandardNormalRNG: the child generator
+        """
+        seq = self.rng.bit_generator.seed_seq
+        return StandardNormalRNG(
+            np.random.SeedSequence(
+                seq.entropy, spawn_key=seq.spawn_key + (index,), pool_size=seq.pool_size
+            )
+        )
+
+
+class SobolNormalRNG(StandardNormalRNG):
+    """Quasi-random standard normals from a scrambled Sobol sequence
+
+    A drop-in replacement for StandardNormalRNG in path generators that draw
+    one normal per path and time step. Each path is one Sobol point of
+    dimension num_steps mapped through the inverse normal CDF and assembled
+    with a Brownian bridge, so that the first, best distributed coordinates
+    decide the terminal value and the coarse shape of the path. The draws
+    are returned as the equivalent independent per-step increments.
+
+    Sobol points are best drawn in powers of 2. Different seeds (and streams)
+    give independently scrambled sequences, whose averages can be combined
+    into a randomized QMC estimate with a valid standard error.
+    """
+
+    def __init__(self, num_steps: int, seed, scramble: bool = True) -> None:
+        """Initializer
+
+        Args:
+            num_steps (int): dimension, the number of normals per path
+            seed: seed of the scrambling
+            scramble (bool, optional): Owen scrambling of the sequence. Without
+            it the sequence is deterministic and the seed unused. Defaults to
+            True.
+        """
+        super().__init__(seed)
+        self.num_steps = num_steps
+        self.scramble = scramble
+        self.sampler = qmc.Sobol(num_steps, scramble=scramble, seed=self.rng)
+        if not scramble:
+            # The first unscrambled point is 0, mapped to -inf
+            self.sampler.fast_forward(1)
+        self.bridge = BrownianBridge(np.arange(1.0, num_steps + 1))
+        self._rows = None
+        self._next_row = 0
+
+    def _increments(self, num_paths: int) -> np.ndarray:
+        """Next num_paths points as per-step increments, shape (steps, paths)"""
+        z = ndtri(self.sampler.random(num_paths))
+        w = self.bridge.build(z)
+        w[:, 1:] -= w[:, :-1].copy()
+        return w.T
+
+    def single(self) -> float:
+        """A single quasi-random number, see vector"""
+        return self.vector(1)[0]
+
+    def vector(self, size: int) -> np.ndarray[np.float64]:
+        """The normals of the next time step for size paths
+
+        The num_steps consecutive calls of a step loop return the rows of one
+        matrix(num_steps, size) draw.
+        """
+        if self._rows is None or self._next_row == self.num_steps or self._rows.shape[1] != size:
+            self._rows = self._increments(size)
+            self._next_row = 0
+        self._next_row += 1
+        return self._rows[self._next_row - 1]
+
+    def matrix(self, rows: int, cols: int) -> np.ndarray[np.float64]:
+        """Normals for cols paths of rows time steps, one path per column"""
+        if rows != self.num_steps:
+            raise ValueError(f"rows must be the Sobol dimension {self.num_steps}, got {rows}")
+        return self._increments(cols)
+
+    def stream(self, index: int) -> "SobolNormalRNG":
+        """An independently scrambled copy of the sequence, see
+        StandardNormalRNG.stream"""
+        seq = self.rng.bit_generator.seed_seq
+        return SobolNormalRNG(
+            self.num_steps,
+            np.random.SeedSequence(
+                seq.entropy, spawn_key=seq.spawn_key + (index,), pool_size=seq.pool_size
+            ),
+            self.scramble,
+        )
+
 
 class Paths:
     """Encapsulates underlying price paths where the row index corresponds to
     the path number and column index corresponds to the time step"""
 
-    def __init__(self, time_step: float, data: np.ndarray):
+    def __init__(self, time_step: float, data: np.ndarray, times: np.ndarray | None = None):
         """
 
         Args:
-            time_step (float): _description_
-            data (np.ndarray): _description_
+            time_step (float): time between columns (the average one if the
+            columns are unevenly spaced)
+            data (np.ndarray): underlying prices, one row per path
+            times (np.ndarray | None, optional): time of each column. Defaults
+            to evenly spaced columns time_step apart starting at 0.
         """
         self.num_paths = data.shape[0]
         self.num_steps = data.shape[1] - 1
         self.time_step = time_step
+        self.times = time_step * np.arange(self.num_steps + 1) if times is None else times
         self._storage = data
 
     def __getitem__(self, key) -> np.ndarray[Any, float]:
@@ -55,10 +162,213 @@ class Paths:
     def __repr__(self) -> str:
         return f"Paths(time_step={self.time_step}, data={repr(self._storage)})"
 
+    @classmethod
+    def concatenate(cls, blocks: list["Paths"]) -> "Paths":
+        """Stack consecutive blocks of paths into one"""
+        return Paths(
+            time_step=blocks[0].time_step,
+            data=np.concatenate([b[:] for b in blocks]),
+            times=blocks[0].times,
+        )
+
+
+class MultiAssetPaths(Paths):
+    """Paths of several underlyings stored as an (assets, paths, steps + 1)
+    tensor, paths with the same index being simulated jointly"""
+
+    def __init__(self, time_step: float, data: np.ndarray, times: np.ndarray | None = None):
+        """
+
+        Args:
+            time_step (float): time between columns
+            data (np.ndarray): underlying prices of shape (num_assets,
+            num_paths, num_steps + 1)
+            times (np.ndarray | None, optional): see Paths. Defaults to None.
+        """
+        super().__init__(time_step, data[0], times)
+        self.num_assets = data.shape[0]
+        self._storage = data
+
+    def asset(self, index: int) -> Paths:
+        """The paths of a single underlying, as a view"""
+        return Paths(self.time_step, self._storage[index], self.times)
+
+    @classmethod
+    def concatenate(cls, blocks: list["Paths"]) -> "MultiAssetPaths":
+        return MultiAssetPaths(
+            time_step=blocks[0].time_step,
+            data=np.concatenate([b[:] for b in blocks], axis=1),
+            times=blocks[0].times,
+        )
+
+    def __repr__(self) -> str:
+        return f"MultiAssetPaths(time_step={self.time_step}, data={repr(self._storage)})"
+
+
+class SharedPaths(Paths):
+    """Paths stored in a named shared memory block, or in a memory mapped file,
+    that any process can attach to by name without copying the data
+
+    The block starts with a small header holding the shape, precision,
+    time_step and column times, so the name is all an attaching process
+    needs. Pickling a SharedPaths only sends its name, which makes it cheap to
+    pass to pool workers.
+    """
+
+    _HEADER = np.dtype(
+        [("rows", "<i8"), ("cols", "<i8"), ("itemsize", "<i8"), ("time_step", "<f8")]
+    )
+
+    def __init__(self, name: str, memmap: bool = False) -> None:
+        """Attach to existing shared paths
+
+        Args:
+            name (str): shared memory block name, or file path if memmap
+            memmap (bool, optional): if True name is a file created with
+            create(..., memmap=True). Defaults to False.
+        """
+        if memmap:
+            buffer = np.memmap(name, dtype=np.uint8, mode="r+")
+            self._shm = None
+        else:
+            # Python < 3.13 registers attached blocks with this process's
+            # resource tracker, which unlinks them when the process exits;
+            # the block belongs to its creator, so undo the registration
+            if sys.version_info >= (3, 13):
+                self._shm = shared_memory.SharedMemory(name, track=False)
+            else:
+                self._shm = shared_memory.SharedMemory(name)
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            buffer = self._shm.buf
+        self._attach(name, memmap, buffer)
+
+    def _attach(self, name: str, memmap: bool, buffer) -> None:
+        self.name = name
+        self.memmap = memmap
+        header = np.frombuffer(buffer, dtype=self._HEADER, count=1)[0]
+        rows, cols = int(header["rows"]), int(header["cols"])
+        offset = self._data_offset(cols)
+        times = np.frombuffer(buffer, dtype="<f8", count=cols, offset=self._HEADER.itemsize)
+        data = np.frombuffer(
+            buffer, dtype=f"<f{int(header['itemsize'])}", count=rows * cols, offset=offset
+        ).reshape(rows, cols)
+        super().__init__(float(header["time_step"]), data, times)
+
+    @classmethod
+    def _data_offset(cls, cols: int) -> int:
+        """Start of the data, after the header and times, 64 byte aligned"""
+        return -(-(cls._HEADER.itemsize + 8 * cols) // 64) * 64
+
+    @classmethod
+    def create(
+        cls,
+        num_paths: int,
+        num_steps: int,
+        time_step: float,
+        times: np.ndarray | None = None,
+        dtype: np.dtype = np.float64,
+        *,
+        name: str | None = None,
+        memmap: bool = False,
+    ) -> "SharedPaths":
+        """Allocate new, zero filled, shared paths
+
+        Args:
+            num_paths (int): number of paths
+            num_steps (int): number of time steps
+            time_step (float): see Paths
+            times (np.ndarray | None, optional): see Paths. Defaults to None.
+            dtype (np.dtype, optional): np.float64 or np.float32. Defaults to
+            np.float64.
+            name (str | None, optional): block name, or file path if memmap.
+            Defaults to a unique block name, and is required if memmap.
+            memmap (bool, optional): if True back the paths by a file rather
+            than shared memory. Defaults to False.
+
+        Returns:
+            SharedPaths: the new paths, owned by the caller who should unlink
+            them once every process is done
+        """
+        itemsize = np.dtype(dtype).itemsize
+        if itemsize not in (4, 8):
+            raise ValueError("shared paths hold float32 or float64 data")
+        rows, cols = num_paths, num_steps + 1
+        size = cls._data_offset(cols) + rows * cols * itemsize
+
+        self = cls.__new__(cls)
+        if memmap:
+            if name is None:
+                raise ValueError("memmap shared paths need a file path as name")
+            buffer = np.memmap(name, dtype=np.uint8, mode="w+", shape=size)
+            self._shm = None
+        else:
+            self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+            name, buffer = self._shm.name, self._shm.buf
+
+        header = np.frombuffer(buffer, dtype=cls._HEADER, count=1)
+        header[0] = (rows, cols, itemsize, time_step)
+        view = np.frombuffer(buffer, dtype="<f8", count=cols, offset=cls._HEADER.itemsize)
+        view[:] = time_step * np.arange(cols) if times is None else times
+        self._attach(name, memmap, buffer)
+        return self
+
+    @classmethod
+    def from_paths(
+        cls, paths: Paths, *, name: str | None = None, memmap: bool = False
+    ) -> "SharedPaths":
+        """Copy existing paths into new shared paths, see create"""
+        self = cls.create(
+            paths.num_paths,
+            paths.num_steps,
+            paths.time_step,
+            paths.times,
+            paths[:].dtype,
+            name=name,
+            memmap=memmap,
+        )
+        self[:] = paths[:]
+        return self
+
+    def __setitem__(self, key, value) -> None:
+        self._storage[key] = value
+
+    def __reduce__(self):
+        return SharedPaths, (self.name, self.memmap)
+
+    def close(self) -> None:
+        """Detach this process from the paths, which stay available to others"""
+        self._storage = self.times = None
+        if self._shm is not None:
+            self._shm.close()
+
+    def __del__(self) -> None:
+        # Views into the block must go before the block itself is closed
+        self._storage = self.times = None
+
+    def unlink(self) -> None:
+        """Detach and release the underlying block or file"""
+        self.close()
+        if self.memmap:
+            os.remove(self.name)
+        else:
+            if sys.version_info < (3, 13):
+                # An attach in a process sharing our tracker may have dropped
+                # the creator's registration, which unlink expects to find
+                resource_tracker.register(self._shm._name, "shared_memory")
+            self._shm.unlink()
+
+    def __repr__(self) -> str:
+        return f"SharedPaths(name={self.name!r}, memmap={self.memmap})"
+
 
 class PathGenerator(ABC):
     """Abstract base class for generating and storing paths"""
 
+    antithetic: bool = False
+    """True if every block of paths is made of two halves driven by opposite
+    normals, path i of the first half being the antithetic twin of path i of
+    the second half"""
+
     def __init__(self, num_paths: int, num_steps: int):
         """Parent initializer
 
@@ -73,10 +383,52 @@ class PathGenerator(ABC):
     def generate(self) -> Paths:
         """Generate a Path object"""
 
+    def generate_chunk(self, index: int, chunk_size: int) -> Paths:
+        """Generate block number index of the paths split into blocks of
+        chunk_size paths
+
+        Implementations draw block i from an independent stream that depends
+        only on the seed and i, so any block can be generated on its own, in
+        any order or process, and the result is reproducible for a given
+        chunk_size.
+
+        Args:
+            index (int): block number, from 0 to num_chunks(chunk_size) - 1
+            chunk_size (int): number of paths per block, the last block may be
+            smaller
+
+        Returns:
+            Paths: the block
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support chunked generation"
+        )
+
+    def num_chunks(self, chunk_size: int) -> int:
+        """Number of blocks of at most chunk_size paths"""
+        return -(-self.num_paths // chunk_size)
+
+    def generate_chunks(self, chunk_size: int) -> Iterator[Paths]:
+        """Generate the paths as consecutive blocks of at most chunk_size paths
+
+        Only one block is alive at a time when consumed incrementally, so peak
+        memory depends on chunk_size rather than num_paths.
+
+        Args:
+            chunk_size (int): maximum number of paths per block
+
+        Yields:
+            Paths: the blocks, see generate_chunk
+        """
+        for index in range(self.num_chunks(chunk_size)):
+            yield self.generate_chunk(index, chunk_size)
+
 
 class GBMPathGenerator(PathGenerator):
     """Geometric Brownian Motion path generator"""
 
+    antithetic = True
+
     def __init__(
         self,
         num_paths: int,
@@ -87,6 +439,8 @@ class GBMPathGenerator(PathGenerator):
         diffusion: float,
         to_time: float,
         rng: StandardNormalRNG,
+        vectorized: bool = False,
+        dtype: np.dtype = np.float64,
     ) -> None:
         """Initializer
 
@@ -97,6 +451,14 @@ class GBMPathGenerator(PathGenerator):
             drift (float): drift parameter
             diffusion (float): volatility (diffusion) parameter
             to_time (float): the time (year fraction) to simulate to
+            vectorized (bool, optional): if True draw all the normals with a
+            single StandardNormalRNG.matrix call and build the paths from a
+            cumulative sum of log-increments instead of stepping through time
+            in Python. Draws the same random numbers as the step loop, so the
+            paths agree up to floating point rounding. Defaults to False.
+            dtype (np.dtype, optional): precision of the generated paths,
+            np.float32 halves their memory and bandwidth at the cost of about
+            7 significant digits. Defaults to np.float64.
         """
         super().__init__(num_paths, num_steps)
         # Your implementation
@@ -109,36 +471,567 @@ class GBMPathGenerator(PathGenerator):
         self.rng = rng
         self.num_paths = num_paths
         self.time_step_value = to_time / num_steps
+        self.vectorized = vectorized
+        self.dtype = np.dtype(dtype)
 
-    def generate(self) -> Paths:
-        pass
-        # Your implementation
+    def generate(self, out: np.ndarray | None = None) -> Paths:
+        """Generate a Path object
+
+        Args:
+            out (np.ndarray | None, optional): buffer of shape (num_paths,
+            num_steps + 1) to generate into, e.g. to reuse one allocation over
+            repeated calls. Its dtype takes precedence over the generator's.
+            Defaults to a new array.
+
+        Returns:
+            Paths: the paths, backed by out if given
+        """
+        out = self._output(self.num_paths, out)
+        if self.vectorized:
+            return self._generate_block(self.num_paths, self.rng, out)
 
         # taking dt = to_time / num_steps
         dt = self.time_step()
-        paths = np.zeros((self.num_paths, self.num_steps + 1))
+        paths = out
         paths[:, 0] = self.s0
 
         # Implying variance reduction by antithetic variate
         half_paths = self.num_paths // 2
-        
+        first, second = paths[:half_paths], paths[half_paths:]
+        scaled, growth = np.empty((2, half_paths), dtype=paths.dtype)
+
+        # Calculate the drift and diffusion terms
+        drift_term = (self.drift - 0.5 * self.diffusion ** 2) * dt
+        diffusion_term = self.diffusion * np.sqrt(dt)
+
+        # Each step works in place, on two contiguous scratch vectors rather
+        # than fresh temporaries, and writes straight into the output columns
         for step in range(1, self.num_steps + 1):
             # Generate random numbers for half the paths
             z = self.rng.vector(half_paths)
-            
-            # Calculate the drift and diffusion terms
-            drift_term = (self.drift - 0.5 * self.diffusion ** 2) * dt
-            diffusion_term = self.diffusion * np.sqrt(dt)
-            
+            np.multiply(z, diffusion_term, out=scaled, casting="same_kind")
+
             # Apply GBM to first half of paths using original variates
-            paths[:half_paths, step] = paths[:half_paths, step - 1] * np.exp( drift_term + diffusion_term * z)
-            
+            np.add(scaled, drift_term, out=growth)
+            np.exp(growth, out=growth)
+            np.multiply(first[:, step - 1], growth, out=first[:, step])
+
             # Apply GBM to second half of paths using antithetic variates
-            paths[half_paths:, step] = paths[half_paths:, step - 1] * np.exp(drift_term + diffusion_term * (-z))
+            np.subtract(drift_term, scaled, out=growth)
+            np.exp(growth, out=growth)
+            np.multiply(second[:, step - 1], growth, out=second[:, step])
 
         return Paths(time_step=dt, data=paths)
 
+    def generate_chunk(self, index: int, chunk_size: int) -> Paths:
+        return _antithetic_chunk(self, index, chunk_size)
+
+    def _output(self, num_paths: int, out: np.ndarray | None) -> np.ndarray:
+        """Validate a caller-supplied buffer, or allocate one"""
+        shape = (num_paths, self.num_steps + 1)
+        if out is None:
+            return np.empty(shape, dtype=self.dtype)
+        if out.shape != shape or out.dtype not in (np.float32, np.float64):
+            raise ValueError(
+                f"out must be a float32 or float64 array of shape {shape}, "
+                f"got {out.dtype} {out.shape}"
+            )
+        return out
+
+    def _generate_block(
+        self, num_paths: int, rng: StandardNormalRNG, out: np.ndarray | None = None
+    ) -> Paths:
+        """Vectorized generation of num_paths paths from rng, into out if given"""
+        dt = self.time_step()
+        half_paths = num_paths // 2
+        drift_term = (self.drift - 0.5 * self.diffusion**2) * dt
+        diffusion_term = self.diffusion * np.sqrt(dt)
+
+        # Row i of the matrix is the vector the step loop draws at step i + 1
+        z = rng.matrix(self.num_steps, half_paths).T
+
+        log_paths = self._output(num_paths, out)
+        log_paths[:, 0] = np.log(self.s0)
+        np.multiply(z, diffusion_term, out=log_paths[:half_paths, 1:], casting="same_kind")
+        np.negative(log_paths[:half_paths, 1:], out=log_paths[half_paths:, 1:])
+        log_paths[:, 1:] += drift_term
+        np.cumsum(log_paths, axis=1, out=log_paths)
+
+        return Paths(time_step=dt, data=np.exp(log_paths, out=log_paths))
+
     def time_step(self) -> float:
         pass
         # Your implementation
         return self.time_step_value
+
+
+class MultiAssetGBMPathGenerator(PathGenerator):
+    """Correlated Geometric Brownian Motions of several underlyings
+
+    The correlation matrix is Cholesky factored once, and every block of paths
+    is correlated with a single matrix product of the factor with all the
+    block's normals, then built with the same antithetic log-space cumulative
+    sum as the vectorized GBMPathGenerator.
+    """
+
+    antithetic = True
+
+    def __init__(
+        self,
+        num_paths: int,
+        num_steps: int,
+        *,
+        s0: np.ndarray,
+        drift: np.ndarray,
+        diffusion: np.ndarray,
+        correlation: np.ndarray,
+        to_time: float,
+        rng: StandardNormalRNG,
+        dtype: np.dtype = np.float64,
+    ) -> None:
+        """Initializer
+
+        Args:
+            num_paths (int): number of paths
+            num_steps (int): number of time steps
+            s0 (np.ndarray): initial value of each underlying
+            drift (np.ndarray): drift parameters, scalar or one per underlying
+            diffusion (np.ndarray): volatilities, scalar or one per underlying
+            correlation (np.ndarray): positive definite correlation matrix of
+            the underlyings' Brownian motions
+            to_time (float): the time (year fraction) to simulate to
+            rng (StandardNormalRNG): the normal generator
+            dtype (np.dtype, optional): precision of the generated paths.
+            Defaults to np.float64.
+        """
+        super().__init__(num_paths, num_steps)
+        self.s0 = np.asarray(s0, dtype=float)
+        self.num_assets = self.s0.size
+        self.drift = np.broadcast_to(np.asarray(drift, dtype=float), self.s0.shape)
+        self.diffusion = np.broadcast_to(np.asarray(diffusion, dtype=float), self.s0.shape)
+        self.correlation = np.asarray(correlation, dtype=float)
+        if self.correlation.shape != (self.num_assets, self.num_assets):
+            raise ValueError(
+                f"correlation must be {self.num_assets}x{self.num_assets}, "
+                f"got {self.correlation.shape}"
+            )
+        self.cholesky = np.linalg.cholesky(self.correlation)
+        self.to_time = to_time
+        self.rng = rng
+        self.dtype = np.dtype(dtype)
+
+    def time_step(self) -> float:
+        return self.to_time / self.num_steps
+
+    def generate(self) -> MultiAssetPaths:
+        return self._generate_block(self.num_paths, self.rng)
+
+    def generate_chunk(self, index: int, chunk_size: int) -> MultiAssetPaths:
+        return _antithetic_chunk(self, index, chunk_size)
+
+    def _generate_block(self, num_paths: int, rng: StandardNormalRNG) -> MultiAssetPaths:
+        dt = self.time_step()
+        half_paths = num_paths // 2
+        drift_term = ((self.drift - 0.5 * self.diffusion**2) * dt)[:, None, None]
+        diffusion_term = (self.diffusion * np.sqrt(dt))[:, None, None]
+
+        # One product correlates every normal of the block across assets
+        z = rng.matrix(self.num_assets * self.num_steps, half_paths)
+        z = self.cholesky @ z.reshape(self.num_assets, -1)
+        z = z.reshape(self.num_assets, self.num_steps, half_paths).transpose(0, 2, 1)
+
+        shape = (self.num_assets, num_paths, self.num_steps + 1)
+        log_paths = np.empty(shape, dtype=self.dtype)
+        log_paths[:, :, 0] = np.log(self.s0)[:, None]
+        np.multiply(z, diffusion_term, out=log_paths[:, :half_paths, 1:], casting="same_kind")
+        np.negative(log_paths[:, :half_paths, 1:], out=log_paths[:, half_paths:, 1:])
+        log_paths[:, :, 1:] += drift_term
+        np.cumsum(log_paths, axis=2, out=log_paths)
+
+        return MultiAssetPaths(time_step=dt, data=np.exp(log_paths, out=log_paths))
+
+
+class HestonPathGenerator(PathGenerator):
+    """Heston stochastic volatility path generator
+
+    Uses the full truncation Euler scheme of Lord et al.: the variance may go
+    negative between steps but only its positive part enters the drift and
+    diffusion, and the log-price is stepped exactly given the variance. Every
+    step advances all paths with whole-array operations, with antithetic
+    pairs flipping both Brownian motions.
+    """
+
+    antithetic = True
+
+    def __init__(
+        self,
+        num_paths: int,
+        num_steps: int,
+        *,
+        s0: float,
+        v0: float,
+        drift: float,
+        kappa: float,
+        theta: float,
+        xi: float,
+        rho: float,
+        to_time: float,
+        rng: StandardNormalRNG,
+    ) -> None:
+        """Initializer
+
+        Args:
+            num_paths (int): number of paths
+            num_steps (int): number of time steps
+            s0 (float): initial underlying value
+            v0 (float): initial variance
+            drift (float): drift parameter
+            kappa (float): speed of mean reversion of the variance
+            theta (float): long run variance
+            xi (float): volatility of the variance
+            rho (float): correlation of the price and variance Brownian motions
+            to_time (float): the time (year fraction) to simulate to
+            rng (StandardNormalRNG): the normal generator, drawing 2 *
+            num_steps normals per path
+        """
+        super().__init__(num_paths, num_steps)
+        self.s0 = s0
+        self.v0 = v0
+        self.drift = drift
+        self.kappa = kappa
+        self.theta = theta
+        self.xi = xi
+        self.rho = rho
+        self.to_time = to_time
+        self.rng = rng
+
+    def time_step(self) -> float:
+        return self.to_time / self.num_steps
+
+    def generate(self) -> Paths:
+        return self._generate_block(self.num_paths, self.rng)
+
+    def generate_chunk(self, index: int, chunk_size: int) -> Paths:
+        return _antithetic_chunk(self, index, chunk_size)
+
+    def _generate_block(self, num_paths: int, rng: StandardNormalRNG) -> Paths:
+        dt = self.time_step()
+        half_paths = num_paths // 2
+        z = rng.matrix(2 * self.num_steps, half_paths).reshape(2, self.num_steps, half_paths)
+        z = np.concatenate([z, -z], axis=2)
+        z_price = z[0]
+        z_var = self.rho * z[0] + np.sqrt(1 - self.rho**2) * z[1]
+
+        log_paths = np.empty((num_paths, self.num_steps + 1))
+        log_paths[:, 0] = np.log(self.s0)
+        v = np.full(num_paths, float(self.v0))
+        for step in range(self.num_steps):
+            v_plus = np.maximum(v, 0.0)
+            sd = np.sqrt(v_plus * dt)
+            log_paths[:, step + 1] = (
+                log_paths[:, step] + (self.drift - 0.5 * v_plus) * dt + sd * z_price[step]
+            )
+            v += self.kappa * (self.theta - v_plus) * dt + self.xi * sd * z_var[step]
+
+        return Paths(time_step=dt, data=np.exp(log_paths, out=log_paths))
+
+
+class MertonJumpPathGenerator(PathGenerator):
+    """Merton jump-diffusion path generator
+
+    GBM with log-normal jumps arriving as a Poisson process, the drift being
+    compensated so that drift remains the expected growth rate of the price.
+    The number of jumps of every path and step is drawn in one bulk Poisson
+    call, and the sum of n log-normal jump sizes is drawn exactly as a single
+    normal. Antithetic pairs share opposite diffusion normals while their
+    jumps are drawn independently, so pairs remain independent of each other.
+    """
+
+    antithetic = True
+
+    def __init__(
+        self,
+        num_paths: int,
+        num_steps: int,
+        *,
+        s0: float,
+        drift: float,
+        diffusion: float,
+        jump_intensity: float,
+        jump_mean: float,
+        jump_std: float,
+        to_time: float,
+        rng: StandardNormalRNG,
+    ) -> None:
+        """Initializer
+
+        Args:
+            num_paths (int): number of paths
+            num_steps (int): number of time steps
+            s0 (float): initial underlying value
+            drift (float): drift parameter
+            diffusion (float): volatility (diffusion) parameter
+            jump_intensity (float): expected number of jumps per year
+            jump_mean (float): mean of the log jump size
+            jump_std (float): standard deviation of the log jump size
+            to_time (float): the time (year fraction) to simulate to
+            rng (StandardNormalRNG): the normal generator, its NumPy generator
+            also drawing the jump counts
+        """
+        super().__init__(num_paths, num_steps)
+        self.s0 = s0
+        self.drift = drift
+        self.diffusion = diffusion
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.to_time = to_time
+        self.rng = rng
+
+    def time_step(self) -> float:
+        return self.to_time / self.num_steps
+
+    def generate(self) -> Paths:
+        return self._generate_block(self.num_paths, self.rng)
+
+    def generate_chunk(self, index: int, chunk_size: int) -> Paths:
+        return _antithetic_chunk(self, index, chunk_size)
+
+    def _generate_block(self, num_paths: int, rng: StandardNormalRNG) -> Paths:
+        dt = self.time_step()
+        half_paths = num_paths // 2
+        mean_jump = np.exp(self.jump_mean + 0.5 * self.jump_std**2) - 1
+        drift_term = (
+            self.drift - 0.5 * self.diffusion**2 - self.jump_intensity * mean_jump
+        ) * dt
+
+        z = rng.matrix(self.num_steps, half_paths).T
+        counts = rng.rng.poisson(self.jump_intensity * dt, size=(num_paths, self.num_steps))
+        z_jump = rng.matrix(self.num_steps, num_paths).T
+
+        log_paths = np.empty((num_paths, self.num_steps + 1))
+        log_paths[:, 0] = np.log(self.s0)
+        increments = log_paths[:, 1:]
+        np.multiply(z, self.diffusion * np.sqrt(dt), out=increments[:half_paths])
+        np.negative(increments[:half_paths], out=increments[half_paths:])
+        increments += drift_term
+        increments += counts * self.jump_mean + np.sqrt(counts) * self.jump_std * z_jump
+        np.cumsum(log_paths, axis=1, out=log_paths)
+
+        return Paths(time_step=dt, data=np.exp(log_paths, out=log_paths))
+
+
+class BrownianBridge:
+    """Brownian motion sampled at given times in Brownian bridge order
+
+    The last time is sampled first from W(0) = 0, then every other time is
+    filled in by bisection, conditioned on its nearest already sampled
+    neighbours. Normal number k always drives the k-th point of that order, so
+    the terminal value only ever depends on the first normal and the coarse
+    shape of a path on the first few ones.
+    """
+
+    def __init__(self, times: np.ndarray) -> None:
+        """Initializer
+
+        Args:
+            times (np.ndarray): strictly increasing positive sampling times
+        """
+        self.times = np.asarray(times, dtype=float)
+        n = self.times.size
+        t = np.concatenate([[0.0], self.times])
+
+        # Indices below are shifted by one so that 0 stands for W(0) = 0 as a
+        # left neighbour and for "no neighbour" as a right one
+        order, left, right = [n], [0], [0]
+        intervals = [(0, n)]
+        while intervals:
+            lo, hi = intervals.pop(0)
+            if hi - lo < 2:
+                continue
+            mid = (lo + hi) // 2
+            order.append(mid)
+            left.append(lo)
+            right.append(hi)
+            intervals += [(lo, mid), (mid, hi)]
+
+        self.order = np.array(order) - 1
+        self.left = np.array(left) - 1
+        self.right = np.array(right) - 1
+        t_m, t_l, t_r = t[order], t[left], t[right]
+        bridged = self.right >= 0
+        span = np.where(bridged, t_r - t_l, 1.0)
+        self.left_weight = np.where(bridged, (t_r - t_m) / span, 1.0)
+        self.right_weight = np.where(bridged, (t_m - t_l) / span, 0.0)
+        self.std = np.sqrt(np.where(bridged, (t_m - t_l) * (t_r - t_m) / span, t_m - t_l))
+
+    def build(self, z: np.ndarray) -> np.ndarray:
+        """Brownian motion values from normals in bridge order
+
+        Args:
+            z (np.ndarray): standard normals of shape (num_paths, num_times),
+            column k driving the k-th point of the bridge order
+
+        Returns:
+            np.ndarray: W at each time, shape (num_paths, num_times)
+        """
+        w = np.empty_like(z)
+        for k, m in enumerate(self.order):
+            value = self.std[k] * z[:, k]
+            if self.left[k] >= 0:
+                value += self.left_weight[k] * w[:, self.left[k]]
+            if self.right[k] >= 0:
+                value += self.right_weight[k] * w[:, self.right[k]]
+            w[:, m] = value
+        return w
+
+
+class GBMObservationGenerator(PathGenerator):
+    """Geometric Brownian Motion sampled exactly at a few observation dates
+
+    Only the requested dates are simulated, straight from the exact GBM
+    marginals, so a European payoff that needs the terminal date alone costs
+    O(paths) rather than O(paths x steps). The dates are built in Brownian
+    bridge order, which makes the terminal values for a given seed identical
+    whichever intermediate observation dates are requested.
+    """
+
+    antithetic = True
+
+    def __init__(
+        self,
+        num_paths: int,
+        *,
+        s0: float,
+        drift: float,
+        diffusion: float,
+        observation_times: np.ndarray,
+        rng: StandardNormalRNG,
+    ) -> None:
+        """Initializer
+
+        Args:
+            num_paths (int): number of paths
+            s0 (float): initial underlying value
+            drift (float): drift parameter
+            diffusion (float): volatility (diffusion) parameter
+            observation_times (np.ndarray): strictly increasing positive times
+            (year fractions) to sample at
+            rng (StandardNormalRNG): the normal generator
+        """
+        times = np.atleast_1d(np.asarray(observation_times, dtype=float))
+        super().__init__(num_paths, times.size)
+        self.s0 = s0
+        self.drift = drift
+        self.diffusion = diffusion
+        self.rng = rng
+        self.bridge = BrownianBridge(times)
+        self.times = np.concatenate([[0.0], times])
+
+    def generate(self) -> Paths:
+        return self._generate_block(self.num_paths, self.rng)
+
+    def generate_chunk(self, index: int, chunk_size: int) -> Paths:
+        return _antithetic_chunk(self, index, chunk_size)
+
+    def _generate_block(self, num_paths: int, rng: StandardNormalRNG) -> Paths:
+        half_paths = num_paths // 2
+        z = rng.matrix(self.num_steps, half_paths).T
+        w = self.bridge.build(np.concatenate([z, -z]))
+
+        log_paths = np.empty((num_paths, self.num_steps + 1))
+        log_paths[:, 0] = 0.0
+        log_paths[:, 1:] = (self.drift - 0.5 * self.diffusion**2) * self.times[1:]
+        log_paths[:, 1:] += self.diffusion * w
+        paths = self.s0 * np.exp(log_paths, out=log_paths)
+        return Paths(time_step=self.time_step(), data=paths, times=self.times)
+
+    def time_step(self) -> float:
+        """Average time between observation dates"""
+        return self.times[-1] / self.num_steps
+
+
+def _antithetic_chunk(path_generator: PathGenerator, index: int, chunk_size: int) -> Paths:
+    """generate_chunk for generators with a _generate_block(num_paths, rng)"""
+    if chunk_size % 2:
+        raise ValueError("chunk_size must be even to keep antithetic pairs together")
+    num_paths = min(chunk_size, path_generator.num_paths - index * chunk_size)
+    return path_generator._generate_block(num_paths, path_generator.rng.stream(index))
+
+
+@dataclass
+class SampleMoments:
+    """Storage class for the count, mean and sum of squared deviations of a
+    set of samples, mergeable without loss of precision (Chan et al.)"""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    """Sum of squared deviations from the mean"""
+
+    @classmethod
+    def of(cls, samples: np.ndarray, antithetic: bool = False) -> "SampleMoments":
+        """Moments of a block of samples
+
+        Args:
+            samples (np.ndarray): one sample per path
+            antithetic (bool, optional): if True the two halves of samples come
+            from antithetic twin paths, and the moments are those of the pair
+            averages, which are the independent samples. Defaults to False.
+
+        Returns:
+            SampleMoments: the moments
+        """
+        x = np.asarray(samples, dtype=float).ravel()
+        if antithetic:
+            if x.size % 2:
+                raise ValueError("antithetic samples must come in pairs")
+            half = x.size // 2
+            x = 0.5 * (x[:half] + x[half:])
+        if not x.size:
+            return cls()
+        mean = x.mean()
+        return cls(x.size, float(mean), float(np.dot(x - mean, x - mean)))
+
+    def merge(self, other: "SampleMoments") -> "SampleMoments":
+        """Moments of the union of both sets of samples"""
+        count = self.count + other.count
+        if not count:
+            return SampleMoments()
+        delta = other.mean - self.mean
+        return SampleMoments(
+            count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta**2 * self.count * other.count / count,
+        )
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean"""
+        return float(np.sqrt(self.m2 / max(self.count - 1, 1) / self.count))
+
+
+def chunked_mean(
+    path_generator: PathGenerator,
+    func: Callable[[Paths], np.ndarray],
+    chunk_size: int,
+) -> tuple[float, float]:
+    """Monte Carlo estimate reduced block by block over generate_chunks
+
+    For antithetic generators the standard error is computed from the
+    averages over antithetic pairs, as twin paths are not independent.
+
+    Args:
+        path_generator (PathGenerator): an object to generate price paths
+        func (Callable[[Paths], np.ndarray]): maps a block of paths to one
+        sample per path, e.g. a discounted terminal payoff
+        chunk_size (int): maximum number of paths per block
+
+    Returns:
+        tuple[float, float]: the sample mean and its standard error
+    """
+    moments = SampleMoments()
+    for paths in path_generator.generate_chunks(chunk_size):
+        moments = moments.merge(SampleMoments.of(func(paths), path_generator.antithetic))
+
+    return moments.mean, moments.stderr
@@ -0,0 +1,115 @@
+"""
+Scenario and stress grid revaluation of option books
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from final import blackscholes as bs
+from final.book import OptionBook
+from final.dividends import DividendSchedule
+
+# Number of chunk-sized arrays alive at the peak of a revalue chunk, mostly
+# the shared intermediates of bs._batch_terms
+_LIVE_TEMPORARIES = 16
+
+
+def revalue(
+    book: OptionBook,
+    spot: npt.ArrayLike,
+    vol: npt.ArrayLike,
+    rate: npt.ArrayLike,
+    dividend_yield: npt.ArrayLike = 0.0,
+    dividends: DividendSchedule | None = None,
+    *,
+    spot_shocks: npt.ArrayLike,
+    vol_shocks: npt.ArrayLike = (0.0,),
+    time_steps: npt.ArrayLike = (0.0,),
+    by_underlying: bool = False,
+    max_elements: int = 2**22,
+) -> np.ndarray:
+    """Full revaluation P&L of a book over a spot x vol x time grid
+
+    Positions are processed in chunks sized so that all the intermediates of
+    a chunk together hold about max_elements values, which bounds peak memory
+    regardless of book size. Within a chunk the whole grid is priced in a single
+    broadcast batch_price call.
+
+    Args:
+        book (OptionBook): the positions
+        spot (ArrayLike): spot price per underlying id
+        vol (ArrayLike): volatility, scalar or one per position
+        rate (ArrayLike): risk free rate, scalar or one per position
+        dividend_yield (ArrayLike, optional): dividend yield per underlying
+        id. Defaults to 0.
+        dividends (DividendSchedule | None, optional): discrete dividends
+        escrowed out of the spot of non-futures positions, see
+        OptionBook.greeks. Under time decay the dividends that went ex during
+        the elapsed time are dropped. Defaults to None.
+        spot_shocks (ArrayLike): relative spot moves, e.g. -0.1 for -10%
+        vol_shocks (ArrayLike, optional): absolute vol moves, e.g. 0.05 for
+        +5 vol points. Defaults to no shock.
+        time_steps (ArrayLike, optional): elapsed time in years. Defaults to
+        no decay.
+        by_underlying (bool, optional): if True keep a leading underlying
+        axis instead of summing over the whole book. Defaults to False.
+        max_elements (int, optional): memory bound on all intermediates of a
+        chunk, in number of float64 values. Defaults to 2**22 (32 MiB).
+
+    Returns:
+        np.ndarray: P&L cube of shape (spot, vol, time), or
+        (num_underlyings, spot, vol, time) if by_underlying
+    """
+    ds = np.asarray(spot_shocks, dtype=float)[:, None, None]
+    dv = np.asarray(vol_shocks, dtype=float)[None, :, None]
+    dt = np.asarray(time_steps, dtype=float)[None, None, :]
+    grid_shape = (ds.shape[0], dv.shape[1], dt.shape[2])
+    grid_size = int(np.prod(grid_shape))
+
+    # Sorting by underlying makes every chunk reduce with a single reduceat
+    order = np.argsort(book.underlying, kind="stable")
+    underlying = book.underlying[order]
+    s, q = book.adjusted_inputs(spot, rate, dividend_yield)
+    s, q, v, r = (
+        np.broadcast_to(np.asarray(a, dtype=float), book.strike.shape)[order]
+        for a in (s, q, vol, rate)
+    )
+    k, t, is_call = book.strike[order], book.expiry[order], book.is_call[order]
+    size = (book.quantity * book.multiplier)[order]
+
+    # Escrowed dividends per position (and time step), subtracted from the
+    # shocked spot since a spot shock moves the cum-dividend price
+    escrow = escrow_base = np.zeros(s.shape)
+    if dividends is not None:
+        stock = ~book.is_future[order]
+        escrow_base = np.where(stock, dividends.pv(underlying, t), 0.0)
+        escrow = np.where(
+            stock[:, None],
+            dividends.pv(underlying[:, None], t[:, None], start=dt.ravel()[None, :]),
+            0.0,
+        )
+    escrow = escrow.reshape(escrow.shape[0], 1, 1, -1)
+
+    base = bs.batch_price(s - escrow_base, k, r, q, v, t, is_call)
+    out = np.zeros((book.num_underlyings, *grid_shape))
+    chunk = max(1, max_elements // (grid_size * _LIVE_TEMPORARIES))
+
+    for start in range(0, len(book), chunk):
+        sl = slice(start, start + chunk)
+        col = (Ellipsis, None, None, None)
+        shocked = bs.batch_price(
+            s[sl][col] * (1 + ds) - escrow[sl],
+            k[sl][col],
+            r[sl][col],
+            q[sl][col],
+            np.maximum(v[sl][col] + dv, 0.0),
+            t[sl][col] - dt,
+            is_call[sl][col],
+        )
+        pnl = size[sl][col] * (shocked - base[sl][col])
+
+        ids = underlying[sl]
+        first = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        out[ids[first]] += np.add.reduceat(pnl, first, axis=0)
+
+    return out if by_underlying else out.sum(axis=0)
@@ -0,0 +1,164 @@
+"""
+Tick-driven incremental repricing of an option book
+"""
+
+import asyncio
+import inspect
+from dataclasses import dataclass, fields
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from final.book import BookRisk, OptionBook
+from final.dividends import DividendSchedule
+
+
+@dataclass
+class RiskUpdate:
+    """Storage class for a coalesced batch of risk changes"""
+
+    underlying: np.ndarray
+    """Ids of the underlyings that ticked since the previous update"""
+    risk: BookRisk
+    """Their new aggregated risk, rows aligned with underlying"""
+    change: BookRisk
+    """Change in their aggregated risk since the previous update"""
+
+
+class StreamingRepricer:
+    """Keeps the aggregated risk of a live book current as underlyings tick
+
+    Positions are indexed by underlying once, CSR style, so that a flush only
+    reprices the contracts of the underlyings that ticked since the previous
+    flush. Work per flush is proportional to the number of dirty contracts,
+    not to the size of the book.
+    """
+
+    def __init__(
+        self,
+        book: OptionBook,
+        spot: npt.ArrayLike,
+        vol: npt.ArrayLike,
+        rate: npt.ArrayLike,
+        dividend_yield: npt.ArrayLike = 0.0,
+        dividends: DividendSchedule | None = None,
+    ) -> None:
+        """Initializer
+
+        Args:
+            book (OptionBook): the positions
+            spot (ArrayLike): initial spot price per underlying id
+            vol (ArrayLike): volatility, scalar or one per position
+            rate (ArrayLike): risk free rate, scalar or one per position
+            dividend_yield (ArrayLike, optional): dividend yield per underlying
+            id. Defaults to 0.
+            dividends (DividendSchedule | None, optional): discrete dividends,
+            see OptionBook.greeks. Defaults to None.
+        """
+        self.book = book
+        self.spot = np.array(
+            np.broadcast_to(np.asarray(spot, dtype=float), (book.num_underlyings,))
+        )
+        self.vol = np.broadcast_to(np.asarray(vol, dtype=float), book.strike.shape)
+        self.rate = np.broadcast_to(np.asarray(rate, dtype=float), book.strike.shape)
+        self.dividend_yield = dividend_yield
+        self.dividends = dividends
+
+        self._order = np.argsort(book.underlying, kind="stable")
+        self._offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(book.underlying, minlength=book.num_underlyings))]
+        )
+        self._dirty: set[int] = set()
+        self.risk = book.risk(self.spot, self.vol, self.rate, dividend_yield, dividends)
+
+    def on_tick(self, underlying: int, spot: float) -> None:
+        """Record a new spot price, repricing is deferred to the next flush"""
+        if self.spot[underlying] != spot:
+            self.spot[underlying] = spot
+            self._dirty.add(int(underlying))
+
+    def flush(self) -> RiskUpdate | None:
+        """Reprice the contracts of every underlying that ticked since the
+        previous flush
+
+        Returns:
+            RiskUpdate | None: the new risk of the dirty underlyings and its
+            change, or None if nothing ticked
+        """
+        if not self._dirty:
+            return None
+        dirty = np.fromiter(sorted(self._dirty), dtype=np.intp)
+        self._dirty.clear()
+
+        index = np.concatenate(
+            [self._order[self._offsets[u] : self._offsets[u + 1]] for u in dirty]
+        )
+        subset = self.book.subset(index)
+        new = subset.risk(
+            self.spot,
+            self.vol[index],
+            self.rate[index],
+            self.dividend_yield,
+            self.dividends,
+        )
+
+        current, change = {}, {}
+        for f in fields(BookRisk):
+            total = getattr(self.risk, f.name)
+            # Underlyings without positions do not appear in the subset
+            rows = np.zeros(dirty.shape)
+            known = dirty < subset.num_underlyings
+            rows[known] = getattr(new, f.name)[dirty[known]]
+            change[f.name] = rows - total[dirty]
+            total[dirty] = rows
+            current[f.name] = rows
+        return RiskUpdate(dirty, BookRisk(**current), BookRisk(**change))
+
+    async def run(
+        self,
+        ticks: asyncio.Queue,
+        publish: Callable[[RiskUpdate], Awaitable[Any] | Any],
+        cadence: float = 0.1,
+    ) -> None:
+        """Consume (underlying, spot) ticks and publish coalesced updates
+
+        Ticks arriving between two publications are coalesced: an underlying
+        that ticks many times is repriced once, at its latest spot. Nothing is
+        published for intervals without ticks. A None item flushes any pending
+        ticks and stops the loop.
+
+        Args:
+            ticks (asyncio.Queue): queue of (underlying, spot) tuples
+            publish (Callable[[RiskUpdate], Awaitable[Any] | Any]): called with
+            each update, awaited if it returns an awaitable
+            cadence (float, optional): seconds between publications. Defaults
+            to 0.1.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + cadence
+        stop = False
+
+        while not stop:
+            try:
+                tick = ticks.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    tick = await asyncio.wait_for(
+                        ticks.get(), max(deadline - loop.time(), 0.0)
+                    )
+                except TimeoutError:
+                    tick = ()
+
+            if tick is None:
+                stop = True
+            elif tick:
+                self.on_tick(*tick)
+
+            if stop or loop.time() >= deadline:
+                update = self.flush()
+                if update is not None:
+                    result = publish(update)
+                    if inspect.isawaitable(result):
+                        await result
+                deadline = loop.time() + cadence
@@ -0,0 +1,183 @@
+"""
+Implied volatility surface built from an option chain
+"""
+
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from final.impliedvol import implied_volatility
+
+
+class VolSurface:
+    """Implied volatility surface over log-moneyness x = log(K / S) and time
+
+    Implied vols are solved for the whole chain at once and a polynomial smile
+    in total variance w(x) = v^2 t is fitted per expiry. Between expiries total
+    variance is interpolated linearly in time, and vols are extrapolated flat
+    before the first and after the last expiry. The result is precomputed on a
+    uniform (time, moneyness) grid so that vol lookups only do index
+    arithmetic and a bilinear read. An expiry without any valid quote has no
+    smile, and the grid rows interpolated from it are NaN.
+    """
+
+    def __init__(
+        self,
+        spot: float,
+        strikes: npt.ArrayLike,
+        expiries: npt.ArrayLike,
+        prices: npt.ArrayLike,
+        is_call: npt.ArrayLike,
+        rate: float | Callable[[float], float],
+        dividend_yield: float = 0.0,
+        *,
+        smile_degree: int = 2,
+        num_moneyness: int = 201,
+        num_times: int = 101,
+    ) -> None:
+        """Initializer
+
+        Args:
+            spot (float): underlying spot price
+            strikes (ArrayLike): quote strike prices
+            expiries (ArrayLike): quote times to expiry
+            prices (ArrayLike): quote option prices
+            is_call (ArrayLike): boolean mask, True for calls and False for puts
+            rate (float | Callable[[float], float]): continuous risk free rate,
+            or a curve evaluated once per expiry, e.g.
+            `lambda t: riskfreerate.risk_free_rate(treasury, t) / 100`
+            dividend_yield (float, optional): continuous dividend yield.
+            Defaults to 0.
+            smile_degree (int, optional): polynomial degree of each smile.
+            Defaults to 2.
+            num_moneyness (int, optional): grid size along log-moneyness, at
+            least 2. Defaults to 201.
+            num_times (int, optional): grid size along time, at least 2.
+            Defaults to 101.
+        """
+        self.spot = spot
+        self.dividend_yield = dividend_yield
+        self.smile_degree = smile_degree
+
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.prices = np.asarray(prices, dtype=float).copy()
+        self.is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), self.strikes.shape)
+        self.expiries, self._expiry_index = np.unique(
+            np.asarray(expiries, dtype=float), return_inverse=True
+        )
+        if callable(rate):
+            self.rates = np.array([rate(t) for t in self.expiries], dtype=float)
+        else:
+            self.rates = np.full(self.expiries.shape, rate, dtype=float)
+
+        self.log_moneyness = np.log(self.strikes / spot)
+        self.implied_vols = np.full(self.strikes.shape, np.nan)
+        self.coefficients = np.full((self.expiries.size, smile_degree + 1), np.nan)
+
+        self.x_grid = np.linspace(
+            self.log_moneyness.min(), self.log_moneyness.max(), num_moneyness
+        )
+        self.t_grid = np.linspace(0.0, self.expiries.max(), num_times)
+        self._dx = self.x_grid[1] - self.x_grid[0]
+        self._dt = self.t_grid[1] - self.t_grid[0]
+
+        # Bracketing expiries and weights of each grid time, computed once
+        hi = np.clip(np.searchsorted(self.expiries, self.t_grid), 0, self.expiries.size - 1)
+        lo = np.clip(hi - 1, 0, None)
+        t_lo, t_hi = self.expiries[lo], self.expiries[hi]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(t_hi > t_lo, (self.t_grid - t_lo) / (t_hi - t_lo), 1.0)
+        self._row_lo = lo
+        self._row_hi = hi
+        self._row_weight = np.clip(weight, 0.0, 1.0)
+
+        self._smile_variance = np.full((self.expiries.size, num_moneyness), np.nan)
+        self.grid = np.zeros((num_times, num_moneyness))
+
+        self._solve(np.arange(self.strikes.size))
+        self._refit(np.arange(self.expiries.size))
+
+    def _solve(self, index: np.ndarray) -> None:
+        """Re-solve implied vols of the given quotes"""
+        e = self._expiry_index[index]
+        self.implied_vols[index] = implied_volatility(
+            self.prices[index],
+            self.spot,
+            self.strikes[index],
+            self.rates[e],
+            self.dividend_yield,
+            self.expiries[e],
+            self.is_call[index],
+        )
+
+    def _refit(self, dirty: np.ndarray) -> None:
+        """Refit the smiles of the given expiries and the grid rows they feed"""
+        for e in dirty:
+            quotes = (self._expiry_index == e) & np.isfinite(self.implied_vols)
+            x = self.log_moneyness[quotes]
+            w = self.implied_vols[quotes] ** 2 * self.expiries[e]
+            degree = min(self.smile_degree, x.size - 1)
+            if degree < 0:
+                # No valid quote left, the grid rows this expiry feeds are NaN
+                self.coefficients[e] = np.nan
+                self._smile_variance[e] = np.nan
+                continue
+            coef = np.zeros(self.smile_degree + 1)
+            coef[self.smile_degree - degree :] = np.polyfit(x, w, degree)
+            self.coefficients[e] = coef
+            self._smile_variance[e] = np.maximum(np.polyval(coef, self.x_grid), 0.0)
+
+        rows = np.flatnonzero(np.isin(self._row_lo, dirty) | np.isin(self._row_hi, dirty))
+        lo, hi = self._row_lo[rows], self._row_hi[rows]
+        weight = self._row_weight[rows, None]
+        t = self.t_grid[rows, None]
+        t_lo, t_hi = self.expiries[lo, None], self.expiries[hi, None]
+
+        vol_lo = np.sqrt(self._smile_variance[lo] / t_lo)
+        vol_hi = np.sqrt(self._smile_variance[hi] / t_hi)
+        w = (1 - weight) * self._smile_variance[lo] + weight * self._smile_variance[hi]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vol = np.sqrt(w / t)
+        vol = np.where(t <= t_lo, vol_lo, np.where(t >= t_hi, vol_hi, vol))
+        self.grid[rows] = vol
+
+    def update(self, index: npt.ArrayLike, prices: npt.ArrayLike) -> None:
+        """Incrementally refresh the surface after some quotes changed
+
+        Only the changed quotes are re-solved, only their expiries refitted and
+        only the grid rows bracketed by those expiries recomputed.
+
+        Args:
+            index (ArrayLike): positions of the changed quotes in the chain
+            prices (ArrayLike): their new prices
+        """
+        index = np.atleast_1d(np.asarray(index, dtype=np.intp))
+        self.prices[index] = prices
+        self._solve(index)
+        self._refit(np.unique(self._expiry_index[index]))
+
+    def vol(self, strike: npt.ArrayLike, t: npt.ArrayLike) -> np.ndarray:
+        """Look up implied vols by bilinear interpolation on the cached grid
+
+        Inputs outside the grid are clamped to its edges.
+
+        Args:
+            strike (ArrayLike): strike prices
+            t (ArrayLike): times to expiry
+
+        Returns:
+            np.ndarray: implied volatilities
+        """
+        x = np.log(np.asarray(strike, dtype=float) / self.spot)
+        u = np.clip((x - self.x_grid[0]) / self._dx, 0, self.x_grid.size - 1)
+        w = np.clip((np.asarray(t, dtype=float) - self.t_grid[0]) / self._dt, 0, self.t_grid.size - 1)
+        i = np.minimum(u.astype(np.intp), self.x_grid.size - 2)
+        j = np.minimum(w.astype(np.intp), self.t_grid.size - 2)
+        fu, fw = u - i, w - j
+
+        g = self.grid
+        return (
+            (1 - fw) * ((1 - fu) * g[j, i] + fu * g[j, i + 1])
+            + fw * ((1 - fu) * g[j + 1, i] + fu * g[j + 1, i + 1])
+        )
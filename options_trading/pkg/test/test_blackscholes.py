@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from final import blackscholes as bs
@@ -68,3 +69,65 @@ def test_otm_put():
     assert bs.gamma(**args) == pytest.approx(0.00973454908377432)
     assert bs.vega(**args) == pytest.approx(0.209893913707071 * 100)
     assert bs.theta(**args, is_call=call) == pytest.approx(-0.00449784676156258 * 365)
+
+
+CASES = [
+    (75.5, 50.25, 0.10, 0.02, 0.35, 2.5, True),
+    (35.4, 55.25, 0.08, 0.04, 0.25, 1.5, True),
+    (40.15, 65.25, 0.08, 0.03, 0.25, 2.33, False),
+    (55.5, 45.5, 0.06, 0.02, 0.40, 1.75, False),
+]
+
+
+def test_batch_matches_scalar():
+    s, k, r, q, v, t, is_call = (np.asarray(col) for col in zip(*CASES))
+    greeks = bs.batch_greeks(s, k, r, q, v, t, is_call)
+    for i, (*args, call) in enumerate(CASES):
+        assert greeks.price[i] == pytest.approx(bs.price(*args, is_call=call))
+        assert greeks.delta[i] == pytest.approx(bs.delta(*args, is_call=call))
+        assert greeks.gamma[i] == pytest.approx(bs.gamma(*args))
+        assert greeks.vega[i] == pytest.approx(bs.vega(*args))
+        assert greeks.theta[i] == pytest.approx(bs.theta(*args, is_call=call))
+
+
+def test_batch_edge_cases():
+    s = np.array([110.0, 90.0, 110.0, 90.0])
+    is_call = np.array([True, True, False, False])
+    expired = bs.batch_greeks(s, 100.0, 0.05, 0.0, 0.2, 0.0, is_call)
+    assert expired.price == pytest.approx([10.0, 0.0, 0.0, 10.0])
+    assert expired.delta == pytest.approx([1.0, 0.0, 0.0, -1.0])
+    assert expired.gamma == pytest.approx(np.zeros(4))
+    assert expired.vega == pytest.approx(np.zeros(4))
+
+    no_vol = bs.batch_greeks(s, 100.0, 0.05, 0.0, 0.0, 1.0, is_call)
+    forward_intrinsic = np.maximum(np.where(is_call, 1, -1) * (s - 100.0 * np.exp(-0.05)), 0)
+    assert no_vol.price == pytest.approx(forward_intrinsic)
+    assert np.all(np.isfinite(no_vol.theta))
+
+
+def test_batch_rho():
+    args = dict(s=100.0, k=95.0, r=0.05, q=0.01, v=0.3, t=0.75)
+    bump = 1e-6
+    for call in (True, False):
+        up = bs.price(**{**args, "r": args["r"] + bump}, is_call=call)
+        down = bs.price(**{**args, "r": args["r"] - bump}, is_call=call)
+        rho = bs.batch_greeks(**args, is_call=call).rho
+        assert rho == pytest.approx((up - down) / (2 * bump), rel=1e-5)
+
+
+@pytest.mark.parametrize("call", [True, False])
+def test_batch_higher_order_greeks(call):
+    args = dict(s=100.0, k=95.0, r=0.05, q=0.02, v=0.3, t=0.75)
+    greeks = bs.batch_greeks(**args, is_call=call, higher_order=True)
+
+    def bumped(field, name, h):
+        up = getattr(bs.batch_greeks(**{**args, name: args[name] + h}, is_call=call), field)
+        down = getattr(bs.batch_greeks(**{**args, name: args[name] - h}, is_call=call), field)
+        return (up - down) / (2 * h)
+
+    assert greeks.vanna == pytest.approx(bumped("delta", "v", 1e-5), rel=1e-5)
+    assert greeks.volga == pytest.approx(bumped("vega", "v", 1e-5), rel=1e-5)
+    assert greeks.speed == pytest.approx(bumped("gamma", "s", 1e-3), rel=1e-5)
+    # charm and color are decays in calendar time, i.e. minus the t derivative
+    assert greeks.charm == pytest.approx(-bumped("delta", "t", 1e-5), rel=1e-5)
+    assert greeks.color == pytest.approx(-bumped("gamma", "t", 1e-5), rel=1e-5)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from final import blackscholes as bs
+from final.book import OptionBook
+
+
+def make_book(n: int = 500, seed: int = 3) -> OptionBook:
+    rng = np.random.default_rng(seed)
+    return OptionBook(
+        strike=rng.uniform(80, 120, n),
+        expiry=rng.uniform(0.05, 3.0, n),
+        quantity=rng.integers(-50, 50, n),
+        is_call=rng.random(n) < 0.5,
+        underlying=rng.integers(0, 4, n),
+        multiplier=100,
+    )
+
+
+def test_risk_matches_loop():
+    book = make_book()
+    spot = np.array([100.0, 95.0, 105.0, 110.0])
+    risk = book.risk(spot, vol=0.25, rate=0.04, dividend_yield=0.01)
+
+    value = np.zeros(4)
+    dollar_delta = np.zeros(4)
+    for i in range(len(book)):
+        u = book.underlying[i]
+        args = (spot[u], book.strike[i], 0.04, 0.01, 0.25, book.expiry[i])
+        size = book.quantity[i] * book.multiplier[i]
+        value[u] += size * bs.price(*args, is_call=book.is_call[i])
+        dollar_delta[u] += size * bs.delta(*args, is_call=book.is_call[i]) * spot[u]
+
+    assert risk.value == pytest.approx(value)
+    assert risk.dollar_delta == pytest.approx(dollar_delta)
+
+
+def test_bucket_risk_sums_to_risk():
+    book = make_book()
+    spot = np.array([100.0, 95.0, 105.0, 110.0])
+    risk = book.risk(spot, vol=0.25, rate=0.04)
+    buckets = book.bucket_risk(spot, vol=0.25, rate=0.04, bucket_edges=[0.5, 1.0, 2.0])
+
+    assert buckets.vega.shape == (4, 4)
+    for field in ("value", "dollar_delta", "dollar_gamma", "vega", "theta", "rho"):
+        assert getattr(buckets, field).sum(axis=1) == pytest.approx(getattr(risk, field))
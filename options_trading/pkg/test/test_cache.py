@@ -0,0 +1,39 @@
+import pytest
+
+from final import blackscholes as bs
+from final.cache import PricingCache
+
+ARGS = dict(s=75.5, k=50.25, r=0.10, q=0.02, v=0.35, t=2.5)
+
+
+def test_hits_on_quantized_inputs():
+    cache = PricingCache(decimals=6)
+    first = cache.price(**ARGS, is_call=True)
+    second = cache.price(**{**ARGS, "s": ARGS["s"] + 1e-9}, is_call=True)
+    assert first == second == pytest.approx(bs.price(**ARGS, is_call=True))
+    assert cache.delta(**ARGS, is_call=True) == pytest.approx(bs.delta(**ARGS, is_call=True))
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+
+def test_lru_eviction():
+    cache = PricingCache(maxsize=2)
+    cache.gamma(**ARGS)
+    cache.vega(**ARGS)
+    cache.gamma(**ARGS)
+    cache.price(**ARGS, is_call=False)
+    cache.vega(**ARGS)
+    assert cache.cache_info() == (1, 4, 2, 2)
+
+
+def test_invalidate_by_market_input():
+    cache = PricingCache()
+    cache.price(**ARGS, is_call=True)
+    cache.price(**{**ARGS, "v": 0.30}, is_call=True)
+    cache.price(**{**ARGS, "r": 0.05}, is_call=True)
+
+    assert cache.invalidate(v=0.35) == 2
+    assert cache.cache_info().currsize == 1
+    assert cache.invalidate() == 1
+    assert cache.cache_info().currsize == 0
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from final import blackscholes as bs
+from final import compiled
+
+
+def random_book(n: int = 1000, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    s = rng.uniform(50, 150, n)
+    k = rng.uniform(50, 150, n)
+    v = rng.uniform(0.0, 0.6, n)
+    t = rng.uniform(-0.1, 2.0, n)
+    v[:10] = 0.0
+    t[10:20] = 0.0
+    return s, k, 0.04, 0.01, v, t, rng.random(n) < 0.5
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_matches_numpy(use_numba):
+    args = random_book()
+    expected = bs.batch_greeks(*args)
+    actual = compiled.greeks(*args, use_numba=use_numba)
+    for field in ("price", "delta", "gamma", "vega", "theta", "rho"):
+        assert getattr(actual, field) == pytest.approx(getattr(expected, field), rel=1e-12, abs=1e-12)
+    assert compiled.price(*args, use_numba=use_numba) == pytest.approx(expected.price, rel=1e-12, abs=1e-12)
+
+
+def test_kernels_compile():
+    pytest.importorskip("numba")
+    assert compiled.HAS_NUMBA
+    price = compiled.price(100.0, 100.0, 0.05, 0.0, 0.2, 1.0, True)
+    assert price == pytest.approx(bs.price(100.0, 100.0, 0.05, 0.0, 0.2, 1.0, True))
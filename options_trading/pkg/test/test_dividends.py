@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from final import blackscholes as bs
+from final.book import OptionBook
+from final.dividends import DividendSchedule
+
+
+def test_pv_lookup():
+    schedule = DividendSchedule(
+        underlying=[2, 0, 0, 2],
+        ex_time=[0.3, 0.5, 0.25, 0.8],
+        amount=[1.0, 2.0, 2.0, 1.5],
+        rate=np.array([0.05, 0.0, 0.02]),
+    )
+    pv = schedule.pv([0, 0, 0, 1, 2, 2, 3], [0.1, 0.25, 2.0, 1.0, 0.5, 1.0, 1.0])
+    expected = [
+        0.0,
+        2.0 * np.exp(-0.05 * 0.25),
+        2.0 * (np.exp(-0.05 * 0.25) + np.exp(-0.05 * 0.5)),
+        0.0,
+        np.exp(-0.02 * 0.3),
+        np.exp(-0.02 * 0.3) + 1.5 * np.exp(-0.02 * 0.8),
+        0.0,
+    ]
+    assert pv == pytest.approx(expected)
+
+
+def test_black76_matches_black_scholes_on_forward():
+    s, k, r, q, v, t = 100.0, 105.0, 0.04, 0.01, 0.25, 0.8
+    f = s * np.exp((r - q) * t)
+    black = bs.batch_black76_greeks(f, k, r, v, t, True)
+    assert black.price == pytest.approx(bs.price(s, k, r, q, v, t, True))
+
+    h = 1e-6
+    up = bs.batch_black76_greeks(f, k, r + h, v, t, True).price
+    down = bs.batch_black76_greeks(f, k, r - h, v, t, True).price
+    assert black.rho == pytest.approx((up - down) / (2 * h), rel=1e-6)
+
+
+def test_mixed_book_single_call():
+    schedule = DividendSchedule(underlying=[0], ex_time=[0.4], amount=[3.0], rate=0.04)
+    book = OptionBook(
+        strike=[100.0, 100.0],
+        expiry=[1.0, 1.0],
+        quantity=[1, 1],
+        is_call=[True, False],
+        underlying=[0, 1],
+        is_future=[False, True],
+    )
+    greeks = book.greeks(spot=[100.0, 4500.0], vol=0.2, rate=0.04, dividends=schedule)
+
+    escrowed = 100.0 - 3.0 * np.exp(-0.04 * 0.4)
+    assert greeks.price[0] == pytest.approx(bs.price(escrowed, 100.0, 0.04, 0.0, 0.2, 1.0, True))
+    assert greeks.price[1] == pytest.approx(bs.batch_black76_greeks(4500.0, 100.0, 0.04, 0.2, 1.0, False).price)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from final import blackscholes as bs
+from final import impliedvol as iv
+
+
+def test_round_trip_chain():
+    rng = np.random.default_rng(7)
+    n = 2000
+    s = 100.0
+    k = rng.uniform(60, 150, n)
+    t = rng.uniform(0.05, 2.0, n)
+    v = rng.uniform(0.05, 0.9, n)
+    is_call = rng.random(n) < 0.5
+    prices = bs.batch_price(s, k, 0.04, 0.01, v, t, is_call)
+
+    vols = iv.implied_volatility(prices, s, k, 0.04, 0.01, t, is_call)
+
+    # Deep ITM/OTM quotes whose price rounds to the no-arbitrage bound carry
+    # no vol information and are NaN by design, every other quote converges
+    fwd, strike = s * np.exp(-0.01 * t), k * np.exp(-0.04 * t)
+    intrinsic = np.maximum(np.where(is_call, fwd - strike, strike - fwd), 0.0)
+    ok = prices > intrinsic
+    assert np.isnan(vols[~ok]).all()
+    assert np.isfinite(vols[ok]).all()
+    repriced = bs.batch_price(s, k[ok], 0.04, 0.01, vols[ok], t[ok], is_call[ok])
+    assert repriced == pytest.approx(prices[ok], abs=1e-8)
+
+
+def test_scalar_matches_known_vol():
+    price = bs.price(s=55.5, k=45.5, r=0.06, q=0.02, v=0.40, t=1.75, is_call=False)
+    vol = iv.implied_volatility(price, 55.5, 45.5, 0.06, 0.02, 1.75, False)
+    assert np.ndim(vol) == 0
+    assert vol == pytest.approx(0.40, abs=1e-8)
+
+
+def test_arbitrage_violations_are_nan():
+    vols = iv.implied_volatility(
+        price=[-1.0, 0.0, 200.0, 5.0],
+        s=100.0,
+        k=100.0,
+        r=0.0,
+        q=0.0,
+        t=[1.0, 1.0, 1.0, 0.0],
+        is_call=True,
+    )
+    assert np.all(np.isnan(vols))
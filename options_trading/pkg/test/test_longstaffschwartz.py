@@ -5,8 +5,8 @@ import final as fn
 
 
 class StubGenerator(fn.PathGenerator):
-    def __init__(self, time_step: float, data: np.ndarray):
-        self._paths = fn.Paths(time_step, data)
+    def __init__(self, time_step: float, data: np.ndarray, times: np.ndarray | None = None):
+        self._paths = fn.Paths(time_step, data, times)
         super().__init__(self._paths.num_paths, self._paths.num_steps)
 
     def generate(self) -> fn.Paths:
@@ -35,3 +35,96 @@ def test_paper_example():
         polynomial_degree=2,
     )
     assert price == pytest.approx(0.11443433004505696)
+
+
+# The paper example's paths, shared by the tests below
+PAPER_DATA = np.asarray(
+    [
+        [1.00, 1.09, 1.08, 1.34],
+        [1.00, 1.16, 1.26, 1.54],
+        [1.00, 1.22, 1.07, 1.03],
+        [1.00, 0.93, 0.97, 0.92],
+        [1.00, 1.11, 1.56, 1.52],
+        [1.00, 0.76, 0.77, 0.90],
+        [1.00, 0.92, 0.84, 1.01],
+        [1.00, 0.88, 1.22, 1.34],
+    ]
+)
+
+
+def test_discounts_with_column_times():
+    # Twice the time between dates at half the rate gives the same discount
+    # factors; time_step is only the average spacing and must not be used
+    generator = StubGenerator(time_step=1, data=PAPER_DATA, times=np.array([0.0, 2.0, 4.0, 6.0]))
+    price, debug = fn.lsm_price(
+        strike_price=1.1,
+        risk_free_rate=0.03,
+        is_call=False,
+        path_generator=generator,
+        debug=True,
+    )
+    assert price == pytest.approx(0.11443433004505696)
+    assert [d.t_j for d in debug] == [4.0, 2.0]
+
+
+def test_paper_regressions():
+    _, debug = fn.lsm_price(
+        strike_price=1.1,
+        risk_free_rate=0.06,
+        is_call=False,
+        path_generator=StubGenerator(time_step=1, data=PAPER_DATA),
+        debug=True,
+    )
+    # Longstaff and Schwartz (2001), tables for t = 2 and t = 1
+    df = np.exp(-0.06)
+    assert debug[0].y == pytest.approx(np.array([0.00, 0.07, 0.18, 0.20, 0.09]) * df)
+    assert debug[0].b_hat == pytest.approx([-1.070, 2.983, -1.813], abs=1e-3)
+    assert debug[1].y == pytest.approx(np.array([0.00, 0.13, 0.33, 0.26, 0.00]) * df)
+    assert debug[1].b_hat == pytest.approx([2.038, -3.335, 1.356], abs=1e-3)
+
+
+def american_put(**kwargs) -> float:
+    generator = fn.GBMPathGenerator(
+        num_paths=20_000,
+        num_steps=25,
+        s0=36.0,
+        drift=0.06,
+        diffusion=0.2,
+        to_time=1.0,
+        rng=fn.StandardNormalRNG(seed=14),
+        vectorized=True,
+    )
+    return fn.lsm_price(40.0, 0.06, False, generator, **kwargs)
+
+
+def test_bases_and_solvers():
+    reference = american_put()
+    # Same function space, so the same exercise policy up to rounding
+    for basis in ("scaled_monomial", "hermite", lambda x, degree, strike: np.vander(x, 3)):
+        for solver in fn.SOLVERS:
+            assert american_put(basis=basis, solver=solver) == pytest.approx(reference, rel=1e-10)
+    # Longstaff and Schwartz report 4.472 for this put with weighted Laguerre
+    assert american_put(basis="laguerre", solver="normal") == pytest.approx(4.472, abs=0.05)
+
+    # At a high degree raw powers are too ill-conditioned for the normal
+    # equations, an orthogonal basis makes every solver agree
+    hermite = [american_put(polynomial_degree=8, basis="hermite", solver=s) for s in ("lstsq", "normal", "qr")]
+    assert hermite == pytest.approx([hermite[0]] * 3, rel=1e-10)
+
+    # Deep out of the money some dates have fewer paths in the money than
+    # basis functions, every solver must still give the same price
+    def deep_otm_put(solver: str) -> float:
+        generator = fn.GBMPathGenerator(
+            num_paths=2000,
+            num_steps=50,
+            s0=36.0,
+            drift=0.06,
+            diffusion=0.2,
+            to_time=1.0,
+            rng=fn.StandardNormalRNG(seed=1),
+        )
+        return fn.lsm_price(26.0, 0.06, False, generator, solver=solver)
+
+    otm = [deep_otm_put(s) for s in fn.SOLVERS]
+    assert otm == pytest.approx([otm[0]] * len(otm), rel=1e-10)
+    assert otm[0] > 0
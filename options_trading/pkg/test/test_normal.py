@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from final import blackscholes as bs
+from final import normal
+
+
+def test_special_matches_scipy():
+    x = np.linspace(-10, 10, 2001)
+    backend = normal.SpecialNormal()
+    assert backend.cdf(x) == pytest.approx(norm.cdf(x), abs=1e-15)
+    assert backend.pdf(x) == pytest.approx(norm.pdf(x), abs=1e-15)
+    assert backend.cdf(0.3) == pytest.approx(norm.cdf(0.3), abs=1e-15)
+    assert backend.pdf(0.3) == pytest.approx(norm.pdf(0.3), abs=1e-15)
+
+
+def test_table_error_bound():
+    x = np.concatenate([np.linspace(-12, 12, 100_001), [-np.inf, np.inf]])
+    backend = normal.TableNormal()
+    assert np.max(np.abs(backend.cdf(x) - norm.cdf(x))) <= backend.max_error
+    assert abs(backend.cdf(0.3) - norm.cdf(0.3)) <= backend.max_error
+    assert np.isnan(backend.cdf(np.array([np.nan, 0.0]))).tolist() == [True, False]
+
+
+def test_set_backend_applies_to_pricing():
+    args = dict(s=75.5, k=50.25, r=0.10, q=0.02, v=0.35, t=2.5, is_call=True)
+    exact = bs.price(**args)
+    previous = normal.set_backend(normal.TableNormal())
+    try:
+        assert bs.price(**args) == pytest.approx(exact, abs=1e-5)
+        assert bs.batch_price(**args) == pytest.approx(exact, abs=1e-5)
+    finally:
+        normal.set_backend(previous)
+    assert isinstance(normal.get_backend(), normal.SpecialNormal)
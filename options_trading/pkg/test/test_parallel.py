@@ -0,0 +1,72 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import final as fn
+from final import parallel
+
+
+def make_generator() -> fn.GBMPathGenerator:
+    return fn.GBMPathGenerator(
+        num_paths=20_000,
+        num_steps=10,
+        s0=100,
+        drift=0.05,
+        diffusion=0.2,
+        to_time=1,
+        rng=fn.StandardNormalRNG(seed=21),
+    )
+
+
+def discounted_call(paths: fn.Paths) -> np.ndarray:
+    return np.exp(-0.05) * np.maximum(paths[:, -1] - 100, 0)
+
+
+def test_worker_count_does_not_change_results():
+    generator = make_generator()
+    single = parallel.parallel_mean(generator, discounted_call, chunk_size=4000, num_workers=1)
+    multi = parallel.parallel_mean(generator, discounted_call, chunk_size=4000, num_workers=3)
+    assert single == multi
+    assert single[0] == pytest.approx(10.450583572185565, abs=4 * single[1])
+
+
+def test_parallel_generate_matches_chunks():
+    generator = make_generator()
+    paths = parallel.parallel_generate(generator, chunk_size=6000, num_workers=2)
+    expected = np.concatenate([c[:] for c in generator.generate_chunks(6000)])
+    assert paths.shape == (20_000, 11)
+    np.testing.assert_array_equal(paths[:], expected)
+
+
+def test_workers_start_after_numba_kernels_ran():
+    compiled = pytest.importorskip("final.compiled")
+    pytest.importorskip("numba")
+    compiled.greeks(np.full(1000, 100.0), 100.0, 0.05, 0.0, 0.2, 1.0, True)
+    generator = make_generator()
+    single = parallel.parallel_mean(generator, discounted_call, chunk_size=4000, num_workers=1)
+    multi = parallel.parallel_mean(generator, discounted_call, chunk_size=4000, num_workers=2)
+    assert single == multi
+
+
+def put_mean(paths: fn.Paths, strike: float) -> float:
+    return float(np.maximum(strike - paths[:, -1], 0).mean())
+
+
+def test_shared_paths_across_workers():
+    generator = make_generator()
+    shared = fn.SharedPaths.create(generator.num_paths, generator.num_steps, 0.1)
+    try:
+        parallel.parallel_generate(generator, chunk_size=6000, num_workers=2, out=shared)
+        expected = parallel.parallel_generate(generator, chunk_size=6000, num_workers=1)
+        np.testing.assert_array_equal(shared[:], expected[:])
+
+        # Workers attach to the block by name rather than receiving a copy
+        strikes = [90.0, 100.0, 110.0]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(2, mp_context=context) as pool:
+            means = list(pool.map(put_mean, [shared] * 3, strikes))
+        assert means == [put_mean(expected, k) for k in strikes]
+    finally:
+        shared.unlink()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import final as fn
+from final.pathcache import PathCache
+
+
+def make_generator(**kwargs) -> fn.GBMPathGenerator:
+    params = dict(num_paths=2000, num_steps=30, s0=100.0, drift=0.05, diffusion=0.2, to_time=1.0)
+    params.update(kwargs)
+    return fn.GBMPathGenerator(**params, rng=fn.StandardNormalRNG(seed=13))
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_replay_and_bumps_match_direct_generation(vectorized):
+    cache = PathCache()
+    direct_generator = make_generator(vectorized=vectorized)
+    direct = direct_generator.generate()
+
+    generator = make_generator(vectorized=vectorized)
+    first = cache.generate(generator)
+    np.testing.assert_allclose(first[:], direct[:], rtol=1e-12)
+    # The rng is left where generate would leave it
+    assert generator.rng.single() == direct_generator.rng.single()
+
+    hits = cache.cache_info().hits
+    again = cache.generate(make_generator(vectorized=vectorized))
+    np.testing.assert_array_equal(again[:], first[:])
+    assert cache.cache_info().hits == hits + 1
+
+    # A bumped spot only rescales the cached paths
+    bumped = cache.generate(make_generator(s0=101.0, vectorized=vectorized))
+    assert cache.cache_info().hits == hits + 2
+    np.testing.assert_allclose(bumped[:], make_generator(s0=101.0, vectorized=vectorized).generate()[:], rtol=1e-12)
+
+    # A bumped vol reuses the cached normals
+    misses = cache.cache_info().misses
+    vega = cache.generate(make_generator(diffusion=0.21, vectorized=vectorized))
+    assert cache.cache_info().misses == misses + 1
+    np.testing.assert_allclose(vega[:], make_generator(diffusion=0.21, vectorized=vectorized).generate()[:], rtol=1e-12)
+
+
+def test_eviction_spills_to_disk(tmp_path):
+    cache = PathCache(max_bytes=600_000, spill_dir=tmp_path)
+    first = cache.generate(make_generator())[:].copy()
+    cache.generate(make_generator(diffusion=0.3))
+    assert cache.cache_info().currsize <= 600_000
+    assert list(tmp_path.glob("*.npy"))
+
+    hits = cache.cache_info().hits
+    np.testing.assert_array_equal(cache.generate(make_generator())[:], first)
+    assert cache.cache_info().hits == hits + 1
+
+    cache.clear()
+    assert not list(tmp_path.glob("*.npy"))
+
+
+def test_sobol_normals_pass_through():
+    # The Sobol sequence position lives outside the NumPy bit generator, so
+    # it cannot address cache entries
+    cache = PathCache()
+    rng = fn.SobolNormalRNG(num_steps=8, seed=3)
+    first, second = cache.normals(rng, 8, 16), cache.normals(rng, 8, 16)
+    assert not np.array_equal(first, second)
+    assert cache.cache_info().hits == cache.cache_info().misses == 0
@@ -1,7 +1,13 @@
-import pytest
+import pickle
+import subprocess
+import sys
+from math import exp, factorial, log
+
 import numpy as np
+import pytest
 
 import final as fn
+from final import blackscholes as bs
 
 
 def test_gbm():
@@ -26,3 +32,262 @@ def test_gbm():
 
     assert mu_sim == pytest.approx(mu, rel=1e-2)
     assert vol_sim == pytest.approx(vol, rel=1e-3)
+
+
+def test_gbm_vectorized_matches_loop():
+    kwargs = dict(num_paths=1000, num_steps=50, s0=100, drift=0.05, diffusion=0.2, to_time=1)
+    loop = fn.GBMPathGenerator(**kwargs, rng=fn.StandardNormalRNG(seed=3)).generate()
+    vectorized = fn.GBMPathGenerator(
+        **kwargs, rng=fn.StandardNormalRNG(seed=3), vectorized=True
+    ).generate()
+
+    assert vectorized.time_step == loop.time_step
+    np.testing.assert_allclose(vectorized[:], loop[:], rtol=1e-10)
+    # Antithetic pairs cancel the diffusion term in log space
+    expected = 100**2 * np.exp(2 * (0.05 - 0.02) * np.arange(1, 51) / 50)
+    np.testing.assert_allclose(vectorized[:500, 1:] * vectorized[500:, 1:], np.broadcast_to(expected, (500, 50)), rtol=1e-10)
+
+
+def test_gbm_chunks_reproducible_and_bounded():
+    generator = fn.GBMPathGenerator(
+        num_paths=10_000, num_steps=20, s0=100, drift=0.05, diffusion=0.2,
+        to_time=1, rng=fn.StandardNormalRNG(seed=5),
+    )
+    chunks = list(generator.generate_chunks(4000))
+    assert [c.num_paths for c in chunks] == [4000, 4000, 2000]
+    again = list(generator.generate_chunks(4000))
+    for a, b in zip(chunks, again):
+        np.testing.assert_array_equal(a[:], b[:])
+
+    # European call via incremental reduction matches Black-Scholes
+    def discounted_call(paths):
+        return np.exp(-0.05) * np.maximum(paths[:, -1] - 100, 0)
+
+    mean, stderr = fn.chunked_mean(generator, discounted_call, chunk_size=2000)
+    assert mean == pytest.approx(10.450583572185565, abs=4 * stderr)
+
+
+def test_brownian_bridge_covariance():
+    times = np.array([0.1, 0.25, 0.5, 0.6, 1.0])
+    bridge = fn.BrownianBridge(times)
+    z = np.random.default_rng(0).standard_normal((200_000, times.size))
+    w = bridge.build(z)
+    np.testing.assert_allclose(np.cov(w, rowvar=False), np.minimum.outer(times, times), atol=1e-2)
+
+
+def test_observation_generator():
+    kwargs = dict(num_paths=200_000, s0=100, drift=0.05, diffusion=0.2)
+    terminal = fn.GBMObservationGenerator(
+        **kwargs, observation_times=[1.0], rng=fn.StandardNormalRNG(seed=8)
+    ).generate()
+    monthly = fn.GBMObservationGenerator(
+        **kwargs, observation_times=np.arange(1, 13) / 12, rng=fn.StandardNormalRNG(seed=8)
+    ).generate()
+
+    # Bridge ordering: the terminal values do not depend on the other dates
+    np.testing.assert_allclose(monthly[:, -1], terminal[:, -1], rtol=1e-12)
+    assert monthly.times[-1] == 1.0
+    assert terminal[:, -1].mean() == pytest.approx(100 * np.exp(0.05), rel=2e-3)
+    assert monthly[:, 6].mean() == pytest.approx(100 * np.exp(0.05 * 0.5), rel=2e-3)
+
+
+def test_sample_moments_merge_and_antithetic_pairs():
+    x = 1e8 + np.random.default_rng(3).standard_normal(10_001)
+    merged = fn.SampleMoments()
+    for block in np.array_split(x, 7):
+        merged = merged.merge(fn.SampleMoments.of(block))
+    assert merged.count == x.size
+    assert merged.mean == pytest.approx(x.mean(), rel=1e-15)
+    assert merged.m2 / (x.size - 1) == pytest.approx(np.var(x, ddof=1), rel=1e-9)
+
+    # A straddle is nearly symmetric in z, so twin paths are strongly
+    # correlated and the error must be measured over pair averages
+    generator = fn.GBMPathGenerator(
+        num_paths=10_000,
+        num_steps=5,
+        s0=100,
+        drift=0.0,
+        diffusion=0.2,
+        to_time=1,
+        rng=fn.StandardNormalRNG(seed=4),
+    )
+
+    def straddle(paths):
+        return np.abs(paths[:, -1] - 100)
+
+    mean, stderr = fn.chunked_mean(generator, straddle, chunk_size=2000)
+    samples = np.concatenate([straddle(c) for c in generator.generate_chunks(2000)])
+    assert mean == pytest.approx(samples.mean())
+    pairs = np.concatenate(
+        [0.5 * (s[:1000] + s[1000:]) for s in np.split(samples, 5)]
+    )
+    assert stderr == pytest.approx(pairs.std(ddof=1) / np.sqrt(pairs.size))
+    assert stderr > samples.std(ddof=1) / np.sqrt(samples.size)
+
+
+def test_shared_paths_round_trip(tmp_path):
+    paths = fn.GBMPathGenerator(
+        num_paths=100,
+        num_steps=4,
+        s0=100,
+        drift=0.05,
+        diffusion=0.2,
+        to_time=1,
+        rng=fn.StandardNormalRNG(seed=2),
+    ).generate()
+
+    for name, memmap in ((None, False), (str(tmp_path / "paths.bin"), True)):
+        shared = fn.SharedPaths.from_paths(paths, name=name, memmap=memmap)
+        attached = fn.SharedPaths(shared.name, memmap)
+        np.testing.assert_array_equal(attached[:], paths[:])
+        np.testing.assert_array_equal(attached.times, paths.times)
+        assert attached.time_step == paths.time_step
+
+        # Both sides see the same memory, and pickling only sends the name
+        attached[0, 0] = -1.0
+        assert shared[0, 0] == -1.0
+        assert len(pickle.dumps(shared)) < 200
+        attached.close()
+        shared.unlink()
+
+
+def test_shared_paths_outlive_independent_process():
+    paths = fn.GBMPathGenerator(
+        num_paths=100,
+        num_steps=4,
+        s0=100,
+        drift=0.05,
+        diffusion=0.2,
+        to_time=1,
+        rng=fn.StandardNormalRNG(seed=2),
+    ).generate()
+    shared = fn.SharedPaths.from_paths(paths)
+
+    # A separate program, with its own resource tracker, attaches and exits
+    script = (
+        "import sys, final as fn; "
+        "p = fn.SharedPaths(sys.argv[1]); p[0, 0] = -1.0; p.close()"
+    )
+    subprocess.run([sys.executable, "-c", script, shared.name], check=True)
+
+    attached = fn.SharedPaths(shared.name)
+    assert attached[0, 0] == -1.0
+    np.testing.assert_array_equal(attached[1:], paths[1:])
+    attached.close()
+    shared.unlink()
+
+
+def test_sobol_normals_converge_faster():
+    def call_price(rng, vectorized=True):
+        paths = fn.GBMPathGenerator(
+            num_paths=2**12,
+            num_steps=16,
+            s0=100,
+            drift=0.05,
+            diffusion=0.2,
+            to_time=1,
+            rng=rng,
+            vectorized=vectorized,
+        ).generate()
+        return np.exp(-0.05) * np.maximum(paths[:, -1] - 100, 0).mean()
+
+    sobol = np.array([call_price(fn.SobolNormalRNG(16, seed=i)) for i in range(8)])
+    pseudo = np.array([call_price(fn.StandardNormalRNG(seed=i)) for i in range(8)])
+    assert sobol.mean() == pytest.approx(10.450583572185565, abs=0.01)
+    assert sobol.std() < pseudo.std() / 10
+
+    # The step loop consumes the same points one row at a time
+    assert call_price(fn.SobolNormalRNG(16, seed=0), vectorized=False) == pytest.approx(sobol[0])
+    with pytest.raises(ValueError):
+        fn.SobolNormalRNG(16, seed=0).matrix(8, 4)
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_gbm_float32_into_buffer(vectorized):
+    kwargs = dict(num_paths=1000, num_steps=50, s0=100, drift=0.05, diffusion=0.2, to_time=1, vectorized=vectorized)
+    expected = fn.GBMPathGenerator(**kwargs, rng=fn.StandardNormalRNG(seed=3)).generate()
+
+    generator = fn.GBMPathGenerator(**kwargs, rng=fn.StandardNormalRNG(seed=3), dtype=np.float32)
+    buffer = np.empty((1000, 51), dtype=np.float32)
+    paths = generator.generate(out=buffer)
+    assert paths[:].dtype == np.float32
+    assert np.shares_memory(paths[:], buffer)
+    np.testing.assert_allclose(paths[:], expected[:], rtol=1e-5)
+
+    with pytest.raises(ValueError):
+        generator.generate(out=np.empty((1000, 50)))
+
+
+def test_multi_asset_gbm_correlation_and_chunks():
+    correlation = np.array([[1.0, 0.6, -0.3], [0.6, 1.0, 0.2], [-0.3, 0.2, 1.0]])
+    generator = fn.MultiAssetGBMPathGenerator(
+        num_paths=40_000,
+        num_steps=12,
+        s0=[100.0, 50.0, 20.0],
+        drift=0.05,
+        diffusion=[0.2, 0.3, 0.4],
+        correlation=correlation,
+        to_time=1.0,
+        rng=fn.StandardNormalRNG(seed=8),
+    )
+    paths = generator.generate()
+    assert paths.shape == (3, 40_000, 13)
+    assert paths.num_assets == 3 and paths.num_paths == 40_000 and paths.num_steps == 12
+
+    returns = np.log(paths[:, :, 1:] / paths[:, :, :-1]).reshape(3, -1)
+    np.testing.assert_allclose(np.corrcoef(returns), correlation, atol=1e-2)
+    np.testing.assert_allclose(returns.std(axis=1) / np.sqrt(1 / 12), [0.2, 0.3, 0.4], rtol=1e-2)
+
+    # Each asset is a GBM: the discounted forward is the spot
+    forward = np.exp(-0.05) * paths[:, :, -1].mean(axis=1)
+    np.testing.assert_allclose(forward, [100.0, 50.0, 20.0], rtol=1e-2)
+
+    chunks = list(generator.generate_chunks(16_000))
+    assert [c.num_paths for c in chunks] == [16_000, 16_000, 8_000]
+    joined = fn.MultiAssetPaths.concatenate(chunks)
+    np.testing.assert_array_equal(joined.asset(1)[:], np.concatenate([c.asset(1)[:] for c in chunks]))
+
+
+def test_merton_matches_closed_form():
+    s0, k, r, sigma, lam, mu_j, sd_j, t = 100.0, 100.0, 0.05, 0.2, 0.8, -0.1, 0.15, 1.0
+    generator = fn.MertonJumpPathGenerator(
+        num_paths=200_000, num_steps=8, s0=s0, drift=r, diffusion=sigma,
+        jump_intensity=lam, jump_mean=mu_j, jump_std=sd_j, to_time=t,
+        rng=fn.StandardNormalRNG(seed=9),
+    )
+
+    def call(paths):
+        return exp(-r * t) * np.maximum(paths[:, -1] - k, 0)
+
+    mean, stderr = fn.chunked_mean(generator, call, chunk_size=50_000)
+
+    m = exp(mu_j + 0.5 * sd_j**2) - 1
+    lam_m = lam * (1 + m)
+    expected = sum(
+        exp(-lam_m * t) * (lam_m * t) ** n / factorial(n)
+        * bs.price(s0, k, r - lam * m + n * log(1 + m) / t, 0.0, (sigma**2 + n * sd_j**2 / t) ** 0.5, t, True)
+        for n in range(40)
+    )
+    assert mean == pytest.approx(expected, abs=4 * stderr)
+
+    # American put under jumps through the LSM pricer
+    american = fn.lsm_price(110.0, r, False, fn.MertonJumpPathGenerator(
+        num_paths=20_000, num_steps=20, s0=s0, drift=r, diffusion=sigma,
+        jump_intensity=lam, jump_mean=mu_j, jump_std=sd_j, to_time=t,
+        rng=fn.StandardNormalRNG(seed=10),
+    ))
+    assert american > 110.0 - s0
+
+
+def test_heston_reduces_to_gbm_and_is_martingale():
+    kwargs = dict(num_paths=100_000, num_steps=50, s0=100.0, drift=0.03, kappa=2.0, rho=-0.7, to_time=1.0)
+
+    flat = fn.HestonPathGenerator(**kwargs, v0=0.04, theta=0.04, xi=0.0, rng=fn.StandardNormalRNG(seed=11))
+    paths = flat.generate()
+    call = np.exp(-0.03) * np.maximum(paths[:, -1] - 100, 0)
+    stderr = call.std() / np.sqrt(call.size)
+    assert call.mean() == pytest.approx(bs.price(100.0, 100.0, 0.03, 0.0, 0.2, 1.0, True), abs=4 * stderr)
+
+    heston = fn.HestonPathGenerator(**kwargs, v0=0.09, theta=0.04, xi=0.6, rng=fn.StandardNormalRNG(seed=12))
+    mean, stderr = fn.chunked_mean(heston, lambda p: np.exp(-0.03) * p[:, -1], chunk_size=20_000)
+    assert mean == pytest.approx(100.0, abs=4 * stderr)
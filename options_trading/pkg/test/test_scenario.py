@@ -0,0 +1,119 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from final import blackscholes as bs
+from final.book import OptionBook
+from final.dividends import DividendSchedule
+from final.scenario import revalue
+
+
+def test_revalue_matches_loop():
+    rng = np.random.default_rng(5)
+    n = 40
+    book = OptionBook(
+        strike=rng.uniform(80, 120, n),
+        expiry=rng.uniform(0.1, 1.0, n),
+        quantity=rng.integers(-10, 10, n),
+        is_call=rng.random(n) < 0.5,
+        underlying=rng.integers(0, 3, n),
+    )
+    spot = np.array([100.0, 90.0, 110.0])
+    spot_shocks = [-0.1, 0.0, 0.1]
+    vol_shocks = [-0.05, 0.05]
+    time_steps = [0.0, 1 / 365, 0.2]
+
+    cube = revalue(
+        book, spot, 0.2, 0.03,
+        spot_shocks=spot_shocks, vol_shocks=vol_shocks, time_steps=time_steps,
+        by_underlying=True, max_elements=50,
+    )
+    assert cube.shape == (3, 3, 2, 3)
+
+    expected = np.zeros(cube.shape)
+    for p in range(n):
+        u = book.underlying[p]
+        base = bs.batch_price(spot[u], book.strike[p], 0.03, 0.0, 0.2, book.expiry[p], book.is_call[p])
+        for i, ds in enumerate(spot_shocks):
+            for j, dv in enumerate(vol_shocks):
+                for l, dt in enumerate(time_steps):
+                    shocked = bs.batch_price(
+                        spot[u] * (1 + ds), book.strike[p], 0.03, 0.0, 0.2 + dv,
+                        book.expiry[p] - dt, book.is_call[p],
+                    )
+                    expected[u, i, j, l] += book.quantity[p] * (shocked - base)
+
+    assert cube == pytest.approx(expected)
+    total = revalue(book, spot, 0.2, 0.03, spot_shocks=spot_shocks, vol_shocks=vol_shocks, time_steps=time_steps)
+    assert total == pytest.approx(expected.sum(axis=0))
+
+
+def test_revalue_mixed_futures_and_escrowed_book():
+    schedule = DividendSchedule(underlying=[0, 0], ex_time=[0.1, 0.6], amount=[2.0, 3.0], rate=0.04)
+    book = OptionBook(
+        strike=[100.0, 95.0, 4400.0],
+        expiry=[1.0, 0.5, 1.0],
+        quantity=[2, -1, 1],
+        is_call=[True, False, True],
+        underlying=[0, 0, 1],
+        is_future=[False, False, True],
+    )
+    spot = np.array([100.0, 4500.0])
+    spot_shocks, time_steps = [-0.05, 0.05], [0.0, 0.2]
+    cube = revalue(
+        book, spot, 0.2, 0.04, dividends=schedule,
+        spot_shocks=spot_shocks, time_steps=time_steps, by_underlying=True,
+    )
+
+    base = book.greeks(spot, 0.2, 0.04, dividends=schedule).price
+    expected = np.zeros(cube.shape)
+    for p in range(len(book)):
+        u = book.underlying[p]
+        for i, ds in enumerate(spot_shocks):
+            for l, dt in enumerate(time_steps):
+                t = book.expiry[p] - dt
+                if book.is_future[p]:
+                    shocked = bs.batch_black76_greeks(spot[u] * (1 + ds), book.strike[p], 0.04, 0.2, t, True).price
+                else:
+                    # Only dividends going ex after dt and before expiry remain
+                    remaining = sum(
+                        d * np.exp(-0.04 * (ex - dt))
+                        for ex, d in ((0.1, 2.0), (0.6, 3.0))
+                        if dt < ex <= book.expiry[p]
+                    )
+                    shocked = bs.price(
+                        spot[u] * (1 + ds) - remaining, book.strike[p], 0.04, 0.0, 0.2, t, book.is_call[p]
+                    )
+                expected[u, i, 0, l] += book.quantity[p] * (shocked - base[p])
+
+    assert cube == pytest.approx(expected)
+
+
+def test_revalue_peak_memory_within_max_elements():
+    rng = np.random.default_rng(7)
+    n = 5000
+    book = OptionBook(
+        strike=rng.uniform(80, 120, n),
+        expiry=rng.uniform(0.1, 1.0, n),
+        quantity=rng.integers(-10, 10, n),
+        is_call=rng.random(n) < 0.5,
+        underlying=rng.integers(0, 3, n),
+    )
+    max_elements = 2**20
+
+    tracemalloc.start()
+    revalue(
+        book,
+        np.array([100.0, 90.0, 110.0]),
+        0.2,
+        0.04,
+        spot_shocks=np.linspace(-0.2, 0.2, 21),
+        vol_shocks=np.linspace(-0.1, 0.1, 11),
+        time_steps=[0.0, 1 / 365, 7 / 365, 30 / 365],
+        max_elements=max_elements,
+    )
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Book sized arrays come on top of the chunk budget
+    assert peak < 1.5 * 8 * max_elements
@@ -0,0 +1,60 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from final.book import OptionBook
+from final.streaming import StreamingRepricer
+
+
+def make_book(n: int = 300, seed: int = 9) -> OptionBook:
+    rng = np.random.default_rng(seed)
+    return OptionBook(
+        strike=rng.uniform(80, 120, n),
+        expiry=rng.uniform(0.1, 2.0, n),
+        quantity=rng.integers(-20, 20, n),
+        is_call=rng.random(n) < 0.5,
+        underlying=rng.integers(0, 6, n),
+    )
+
+
+def test_flush_matches_full_reprice():
+    book = make_book()
+    spot = np.full(6, 100.0)
+    repricer = StreamingRepricer(book, spot, vol=0.3, rate=0.02)
+    assert repricer.flush() is None
+
+    repricer.on_tick(2, 104.0)
+    repricer.on_tick(5, 97.0)
+    repricer.on_tick(2, 103.0)
+    update = repricer.flush()
+
+    assert update.underlying.tolist() == [2, 5]
+    spot[[2, 5]] = [103.0, 97.0]
+    full = book.risk(spot, vol=0.3, rate=0.02)
+    assert repricer.risk.value == pytest.approx(full.value)
+    assert repricer.risk.dollar_gamma == pytest.approx(full.dollar_gamma)
+    assert update.risk.vega == pytest.approx(full.vega[[2, 5]])
+
+
+def test_run_coalesces_ticks():
+    book = make_book()
+    repricer = StreamingRepricer(book, np.full(6, 100.0), vol=0.3, rate=0.02)
+    before = repricer.risk.dollar_delta.copy()
+    updates = []
+
+    async def main():
+        ticks = asyncio.Queue()
+        for price in (101.0, 102.0, 103.0):
+            ticks.put_nowait((1, price))
+        ticks.put_nowait((4, 99.0))
+        ticks.put_nowait(None)
+        await repricer.run(ticks, updates.append, cadence=10.0)
+
+    asyncio.run(main())
+
+    assert len(updates) == 1
+    assert updates[0].underlying.tolist() == [1, 4]
+    assert updates[0].change.dollar_delta == pytest.approx(
+        repricer.risk.dollar_delta[[1, 4]] - before[[1, 4]]
+    )
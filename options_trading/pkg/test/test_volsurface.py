@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from final import blackscholes as bs
+from final.volsurface import VolSurface
+
+
+def smile(k, t, s=100.0):
+    x = np.log(k / s)
+    return np.sqrt(0.04 + 0.02 * x + 0.1 * x**2) + 0 * t
+
+
+def make_chain():
+    strikes = np.tile(np.linspace(70, 130, 25), 4)
+    expiries = np.repeat([0.25, 0.5, 1.0, 2.0], 25)
+    is_call = strikes >= 100
+    prices = bs.batch_price(100.0, strikes, 0.03, 0.01, smile(strikes, expiries), expiries, is_call)
+    return strikes, expiries, prices, is_call
+
+
+def test_recovers_smile():
+    strikes, expiries, prices, is_call = make_chain()
+    surface = VolSurface(100.0, strikes, expiries, prices, is_call, rate=lambda t: 0.03, dividend_yield=0.01)
+    assert surface.implied_vols == pytest.approx(smile(strikes, expiries), abs=1e-8)
+    assert surface.vol(strikes, expiries) == pytest.approx(smile(strikes, expiries), abs=1e-3)
+    assert surface.vol(100.0, 0.75) == pytest.approx(0.2, abs=1e-3)
+
+
+def test_incremental_update_matches_rebuild():
+    strikes, expiries, prices, is_call = make_chain()
+    surface = VolSurface(100.0, strikes, expiries, prices, is_call, rate=0.03, dividend_yield=0.01)
+
+    changed = np.flatnonzero(expiries == 0.5)[::3]
+    bumped = prices.copy()
+    bumped[changed] *= 1.05
+    surface.update(changed, bumped[changed])
+
+    rebuilt = VolSurface(100.0, strikes, expiries, bumped, is_call, rate=0.03, dividend_yield=0.01)
+    assert surface.grid == pytest.approx(rebuilt.grid)
+    assert surface.coefficients == pytest.approx(rebuilt.coefficients)
+
+    # Invalidating every quote of an expiry must not leave its old smile behind
+    gone = np.flatnonzero(expiries == expiries.max())
+    bumped[gone] = -1.0
+    surface.update(gone, bumped[gone])
+    rebuilt = VolSurface(100.0, strikes, expiries, bumped, is_call, rate=0.03, dividend_yield=0.01)
+    assert np.isnan(surface.coefficients[-1]).all()
+    assert np.isnan(surface.grid[-1]).all()
+    assert surface.grid == pytest.approx(rebuilt.grid, nan_ok=True)
+    assert surface.coefficients == pytest.approx(rebuilt.coefficients, nan_ok=True)